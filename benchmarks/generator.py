@@ -0,0 +1,65 @@
+import random
+from datetime import date, timedelta
+
+TITLES = [
+    "Штукатур-маляр",
+    "Python-разработчик",
+    "Бухгалтер",
+    "Менеджер по продажам",
+    "Водитель категории C",
+    "Аналитик данных",
+    "Инженер-электрик",
+    "Кладовщик",
+    "Тестировщик",
+    "Оператор call-центра",
+]
+CITIES = [
+    "Москва",
+    "Санкт-Петербург",
+    "Новосибирск",
+    "Екатеринбург",
+    "Казань",
+    "Новокузнецк",
+    "Краснодар",
+    "Самара",
+]
+REQUIREMENTS = [
+    "Опыт работы от 1 года.",
+    "Умение работать в команде.",
+    "Знание Python, Django и SQL.",
+    "Ответственность и пунктуальность.",
+    "Знание 1С: Бухгалтерия.",
+    "Водительское удостоверение категории C.",
+    "Грамотная устная и письменная речь.",
+    "Отличное знание всех технологических процессов.",
+]
+START_DATE = date(2024, 1, 1)
+
+
+def generate_records(count, seed=42, start=0):
+    """
+    Детерминированный генератор вакансий в формате Vacancy.to_dict.
+
+    :param count: Количество вакансий.
+    :param seed: Зерно генератора случайных чисел.
+    :param start: Номер первой вакансии, от него строятся ссылки.
+    :return: Генератор словарей.
+    """
+    rnd = random.Random(seed)
+    for number in range(count):
+        roll = rnd.random()
+        if roll < 0.2:
+            salary = 0
+        elif roll < 0.25:
+            salary = "Зарплата не указана"
+        else:
+            salary = rnd.randrange(20000, 300000, 500)
+        published_at = START_DATE + timedelta(days=rnd.randrange(730))
+        yield {
+            "name": rnd.choice(TITLES),
+            "published_at": published_at.strftime("%d.%m.%Y"),
+            "city": rnd.choice(CITIES),
+            "salary": {"from": salary},
+            "snippet": {"requirement": " ".join(rnd.sample(REQUIREMENTS, 2))},
+            "alternate_url": f"https://hh.ru/vacancy/{100000000 + start + number}",
+        }
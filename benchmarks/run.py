@@ -0,0 +1,288 @@
+"""
+Замеры скорости и пикового потребления памяти для основных операций
+хранилища и запросов на синтетических данных.
+
+Запуск: python -m benchmarks.run --sizes 10000 100000 --output bench_results.json
+Сравнение с прошлым запуском: --baseline old_results.json
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import patch
+
+from benchmarks.generator import generate_records
+from src.fileworker import FileWorker
+from src.parallel import ParallelQuery
+from src.recordstore import RecordStore
+from src.serializers import get_serializer
+from src.vacancy import Vacancy
+
+DEFAULT_SIZES = [10_000, 100_000]
+SALARY_RANGE = ("50000", "150000")
+KEYWORDS = "python sql"
+TOP_N = 10
+# Сколько новых вакансий дописывается к файлу из N вакансий
+APPEND_ROWS = 1000
+
+
+def write_records(records, path):
+    """
+    Запись вакансий в JSON-файл в формате FileWorker по одной,
+    без построения списка всех записей.
+
+    :param records: Итерируемый объект со словарями вакансий.
+    :param path: Путь к файлу.
+    """
+    serializer = get_serializer("json")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        separator = "\n"
+        for record in records:
+            file.write(separator + serializer.encode_item(record))
+            separator = ",\n"
+        file.write("\n]")
+
+
+def make_operations(file_json, save_json, query=None, batch=()):
+    """
+    Операции для замера. Каждая принимает список вакансий и возвращает результат.
+    Ввод с клавиатуры подменяется, вывод на экран отправляется в os.devnull.
+    Загрузка читает заранее записанный file_json со всеми вакансиями,
+    сохранение каждый раз пишет в пустой save_json, а дозапись добавляет
+    batch к копии file_json; копия готовится функцией setup операции
+    и в замер не входит.
+    Если передан query (ParallelQuery), добавляются те же запросы
+    к RecordStore в пуле процессов.
+    """
+
+    def save(vacancies):
+        if os.path.exists(save_json):
+            os.remove(save_json)
+        FileWorker(save_json).save(vacancies)
+
+    def append(vacancies):
+        FileWorker(save_json).save(batch)
+
+    def prepare_append():
+        # copy2 сохраняет время изменения, поэтому индекс .ids остаётся актуальным
+        shutil.copy2(file_json, save_json)
+        shutil.copy2(f"{file_json}.ids", f"{save_json}.ids")
+
+    append.setup = prepare_append
+
+    def load(vacancies):
+        return FileWorker(file_json).load()
+
+    def iter_load(vacancies):
+        return sum(1 for _ in FileWorker(file_json).iter_load())
+
+    def top_n(vacancies):
+        return Vacancy.get_top_n_vacancies(vacancies, TOP_N)
+
+    def top_n_stream(vacancies):
+        return Vacancy.get_top_n_vacancies(FileWorker(file_json).iter_load(), TOP_N)
+
+    def top_n_lazy(vacancies):
+        # Полные объекты Vacancy создаются только для попавших в топ
+        top = Vacancy.get_top_n_vacancies(FileWorker(file_json).iter_lazy(), TOP_N)
+        return [vacancy.materialize() for vacancy in top]
+
+    def filter_by_salary(vacancies):
+        with patch("builtins.input", side_effect=SALARY_RANGE):
+            return Vacancy.filter_vacancies_by_salary(vacancies)
+
+    def filter_by_keywords(vacancies):
+        with patch("builtins.input", return_value=KEYWORDS):
+            return Vacancy.filter_vacancies_by_keywords(vacancies)
+
+    def sort_by_date(vacancies):
+        return Vacancy.sort_vacancies_by_date(vacancies)
+
+    operations = {
+        "FileWorker.save": save,
+        f"FileWorker.save (+{len(batch)})": append,
+        "FileWorker.load": load,
+        "FileWorker.iter_load": iter_load,
+        "get_top_n_vacancies": top_n,
+        "get_top_n_vacancies (iter_load)": top_n_stream,
+        "get_top_n_vacancies (iter_lazy)": top_n_lazy,
+        "filter_vacancies_by_salary": filter_by_salary,
+        "filter_vacancies_by_keywords": filter_by_keywords,
+        "sort_vacancies_by_date": sort_by_date,
+    }
+    if query is not None:
+        min_salary, max_salary = (int(value) for value in SALARY_RANGE)
+        operations.update(
+            {
+                "ParallelQuery.top_n": lambda vacancies: query.top_n(TOP_N),
+                "ParallelQuery.filter_by_salary": lambda vacancies: query.filter_by_salary(
+                    min_salary, max_salary
+                ),
+                "ParallelQuery.filter_by_keywords": lambda vacancies: query.filter_by_keywords(
+                    KEYWORDS.split()
+                ),
+                "ParallelQuery.sort_by_date": lambda vacancies: query.sort_by_date(),
+            }
+        )
+    return operations
+
+
+def measure(operation, vacancies, trace_memory):
+    """
+    Время выполнения операции и пиковое потребление памяти.
+
+    :return: Кортеж (секунды, пик памяти в байтах или None).
+    """
+    setup = getattr(operation, "setup", None)
+    gc.collect()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            operation(vacancies)
+            seconds = time.perf_counter() - start
+            peak = None
+            if trace_memory:
+                if setup is not None:
+                    setup()
+                tracemalloc.start()
+                operation(vacancies)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, seed=42, trace_memory=True, workers=None):
+    """
+    Запуск всех замеров.
+
+    :param sizes: Размеры наборов данных.
+    :param seed: Зерно генератора данных.
+    :param trace_memory: Замерять ли пик памяти (повторный прогон под tracemalloc).
+    :param workers: Число процессов для замеров ParallelQuery или None,
+        чтобы их пропустить. Пик памяти учитывает только текущий процесс.
+    :return: Словарь с результатами.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.ExitStack() as stack:
+        file_json = os.path.join(tmp_dir, "vacancies.json")
+        save_json = os.path.join(tmp_dir, "saved.json")
+        query = None
+        if workers:
+            store = stack.enter_context(
+                RecordStore(os.path.join(tmp_dir, "vacancies.rec"), source=file_json)
+            )
+            query = stack.enter_context(ParallelQuery(store, workers=workers))
+        for size in sizes:
+            write_records(generate_records(size, seed), file_json)
+            # Индекс .ids для замера дозаписи строится до замеров
+            FileWorker(file_json).save([])
+            vacancies = FileWorker(file_json).load()
+            batch = [
+                Vacancy.from_dict(item)
+                for item in generate_records(APPEND_ROWS, seed + 1, start=size)
+            ]
+            operations = make_operations(file_json, save_json, query, batch)
+            if query is not None:
+                query.store.open()
+                # Запуск пула процессов не входит в замеры
+                query.top_n(1)
+            for name, operation in operations.items():
+                seconds, peak = measure(operation, vacancies, trace_memory)
+                results.append(
+                    {
+                        "operation": name,
+                        "rows": size,
+                        "seconds": round(seconds, 6),
+                        "rows_per_second": round(size / seconds) if seconds else None,
+                        "peak_memory_bytes": peak,
+                    }
+                )
+                print(
+                    f"{name:<34} {size:>10} строк: {seconds:8.3f} с"
+                    + (f", пик памяти {peak / 2 ** 20:.1f} МБ" if peak else "")
+                )
+            del vacancies
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "workers": workers,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """
+    Сравнение результатов с сохранённым ранее отчётом.
+
+    :return: Список строк вида "операция, строк: было -> стало (xN)".
+    """
+    previous = {
+        (item["operation"], item["rows"]): item["seconds"]
+        for item in baseline["results"]
+    }
+    lines = []
+    for item in report["results"]:
+        before = previous.get((item["operation"], item["rows"]))
+        if before:
+            lines.append(
+                f"{item['operation']}, {item['rows']} строк: "
+                f"{before:.3f} с -> {item['seconds']:.3f} с "
+                f"(x{item['seconds'] / before:.2f})"
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="размеры наборов данных, например 10000 100000 1000000 10000000",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument(
+        "--baseline", help="отчёт предыдущего запуска для сравнения времени"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="не замерять пик памяти"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="замерить также ParallelQuery с указанным числом процессов",
+    )
+    args = parser.parse_args()
+
+    report = run(
+        args.sizes, args.seed, trace_memory=not args.no_memory, workers=args.workers
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+    print(f"Результаты сохранены в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        for line in compare(report, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
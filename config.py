@@ -2,4 +2,10 @@ import os
 
 ROOT_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(ROOT_DIR, 'data')
-file_json = os.path.join(DATA_DIR, "vacancies.json")
\ No newline at end of file
+file_json = os.path.join(DATA_DIR, "vacancies.json")
+areas_json = os.path.join(DATA_DIR, "areas.json")
+http_cache_dir = os.path.join(DATA_DIR, "http_cache")
+records_file = os.path.join(DATA_DIR, "vacancies.rec")
+harvest_checkpoint = os.path.join(DATA_DIR, "harvest.checkpoint.json")
+currencies_json = os.path.join(DATA_DIR, "currencies.json")
+vacancies_db = os.path.join(DATA_DIR, "vacancies.db")
@@ -0,0 +1,73 @@
+"""
+Перевод файла вакансий в другой формат хранения.
+
+Запуск: python -m src.convert data/vacancies.json --format jsonl
+Без параметра --output файл перезаписывается на месте.
+С параметром --compact из файла удаляются повторы и повреждённые записи.
+"""
+
+import argparse
+import os
+
+from src.fileworker import FileWorker
+from src.serializers import SERIALIZERS, detect_serializer, get_serializer
+
+
+def convert(source, target_format, target=None):
+    """
+    Перевод файла вакансий в другой формат.
+
+    :param source: Исходный файл, формат определяется автоматически.
+    :param target_format: Название нового формата.
+    :param target: Файл результата; по умолчанию исходный файл.
+    :return: Количество перенесённых записей.
+    """
+    reader = detect_serializer(source)
+    if reader is None:
+        print(f"Файл {source} не найден или пуст.")
+        return 0
+    writer = get_serializer(target_format)
+    target = target if target is not None else source
+
+    count = 0
+
+    def records():
+        nonlocal count
+        for record in reader.iter_load(source):
+            count += 1
+            yield record
+
+    tmp_file = f"{target}.tmp"
+    writer.dump(records(), tmp_file)
+    os.replace(tmp_file, target)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Перевод файла вакансий в другой формат и сжатие"
+    )
+    parser.add_argument("source", help="исходный файл вакансий")
+    parser.add_argument("--format", choices=list(SERIALIZERS))
+    parser.add_argument("--output", help="файл результата; по умолчанию - исходный")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="удалить повторяющиеся вакансии и повреждённые записи",
+    )
+    args = parser.parse_args()
+    if args.format is None and not args.compact:
+        parser.error("укажите --format, --compact или оба параметра")
+
+    path = args.source
+    if args.format is not None:
+        count = convert(args.source, args.format, args.output)
+        print(f"Перенесено записей: {count}.")
+        path = args.output or args.source
+    if args.compact:
+        count = FileWorker(path).compact()
+        print(f"После сжатия осталось вакансий: {count}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,11 @@ import os
 from abc import ABC, abstractmethod
 
 from config import file_json
-from src.vacancy import Vacancy
+from src.indexes import IdIndex
+from src.metrics import metrics
+from src.querycache import invalidate_path
+from src.serializers import detect_serializer, get_serializer, iter_json_array
+from src.vacancy import LazyVacancy, Vacancy
 
 
 class AbstractFileWorker(ABC):
@@ -23,71 +27,175 @@ class AbstractFileWorker(ABC):
         """Загрузить вакансии из файла."""
         pass
 
+    def iter_load(self):
+        """Загружать вакансии из файла по одной."""
+        yield from self.load()
 
-class FileWorker:
-    def __init__(self, file_json):
+
+class FileWorker(AbstractFileWorker):
+    """
+    Хранилище вакансий в файле. Формат записи задаётся сериализатором,
+    при загрузке формат определяется по содержимому файла.
+
+    :param file_json: Путь к файлу с вакансиями.
+    :param file_format: Формат записи: json, json-compact, orjson, jsonl, msgpack.
+    """
+
+    def __init__(self, file_json, file_format="json"):
         self.file_json = file_json
+        self.serializer = get_serializer(file_format)
 
+    @metrics.timed("save")
     def save(self, vacancies):
         """
         Метод сохранения вакансий в файл.
-        Если вакансии уже существуют, они не будут добавлены.
+        Если вакансии уже существуют, они не будут добавлены. Вакансии
+        сравниваются по идентификатору hh.ru, ключи сохранённых вакансий
+        хранятся в файле <file_json>.ids, поэтому в файл дописываются только
+        новые вакансии без перезаписи всего файла. Запись идёт в формате
+        существующего файла, новый файл создаётся в формате file_format.
 
         :param vacancies: Список вакансий для сохранения.
         """
-        existing_vacancies = self.load()
-        existing_titles = {vacancy.title for vacancy in existing_vacancies}
-
-        new_vacancies = [
-            vacancy for vacancy in vacancies if vacancy.title not in existing_titles
-        ]
-
-        existing_vacancies.extend(new_vacancies)
-
-        with open(self.file_json, "w", encoding="utf-8") as file:
-            json.dump(
-                [vacancy.to_dict() for vacancy in existing_vacancies],
-                file,
-                ensure_ascii=False,
-                indent=4,
-            )
-
+        index = IdIndex(f"{self.file_json}.ids", self.file_json)
+        try:
+            if not index.open():
+                index.rebuild(vacancy.dedup_key for vacancy in self.iter_load())
+
+            new_vacancies = []
+            new_keys = {}
+            for vacancy in vacancies:
+                key = vacancy.dedup_key
+                if key not in index and key not in new_keys:
+                    new_vacancies.append(vacancy)
+                    new_keys[key] = None
+            metrics.count("saved", len(new_vacancies))
+            if not new_vacancies:
+                return
+
+            invalidate_path(self.file_json)
+            records = [vacancy.to_dict() for vacancy in new_vacancies]
+            serializer = detect_serializer(self.file_json)
+            try:
+                if serializer is None:
+                    self.serializer.dump(records, self.file_json)
+                else:
+                    serializer.append(records, self.file_json)
+            except ValueError as e:
+                print(f"Ошибка дозаписи в файл, файл будет перезаписан: {e}")
+                self.serializer.dump(records, self.file_json)
+                index.rebuild(new_keys)
+                return
+            index.add(new_keys)
+        finally:
+            index.close()
+
+    @metrics.timed("load")
     def load(self):
         """
-        Метод загрузки вакансий из JSON-файла.
+        Метод загрузки вакансий из файла.
 
         :return: Список объектов Vacancy, загруженных из файла.
         """
-        if not os.path.exists(self.file_json) or os.path.getsize(self.file_json) == 0:
+        serializer = detect_serializer(self.file_json)
+        if serializer is None:
             return []
         try:
-            with open(self.file_json, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                if not data:
-                    print(
-                        "Файл пуст. Пожалуйста, сделайте API запрос для получения вакансий."
-                    )
-                return [
-                    Vacancy(
-                        item["name"],
-                        item["published_at"],
-                        item["city"],
-                        (
-                            item["salary"]["from"]
-                            if "salary" in item and "from" in item["salary"]
-                            else 0
-                        ),
-                        item["snippet"]["requirement"],
-                        item["alternate_url"],
-                    )
-                    for item in data
-                ]
+            data = serializer.load(self.file_json)
+            if not data:
+                print(
+                    "Файл пуст. Пожалуйста, сделайте API запрос для получения вакансий."
+                )
+            metrics.count("loaded", len(data))
+            return [Vacancy.from_trusted(item) for item in data]
         except KeyError as e:
             print(f"Ошибка: отсутствует необходимый ключ {e} в данных вакансии.")
             return []
         except json.JSONDecodeError as e:
             print(f"Ошибка декодирования JSON: {e}")
             return []
+        except ValueError as e:
+            print(f"Ошибка декодирования файла: {e}")
+            return []
+
+    def iter_load(self, chunk_size=65536):
+        """
+        Потоковая загрузка вакансий из файла.
+        Файл читается частями, поэтому в памяти не держится весь список.
+
+        :param chunk_size: Размер читаемой за раз части файла.
+        :return: Генератор объектов Vacancy.
+        """
+        serializer = detect_serializer(self.file_json)
+        if serializer is None:
+            return
+        try:
+            for item in serializer.iter_load(self.file_json, chunk_size):
+                yield Vacancy.from_trusted(item)
+        except KeyError as e:
+            print(f"Ошибка: отсутствует необходимый ключ {e} в данных вакансии.")
+        except json.JSONDecodeError as e:
+            print(f"Ошибка декодирования JSON: {e}")
+        except ValueError as e:
+            print(f"Ошибка декодирования файла: {e}")
+
+    def compact(self):
+        """
+        Перезаписывает файл в его текущем формате без повторяющихся вакансий
+        и повреждённых записей и заново строит индекс <file_json>.ids.
+
+        :return: Количество вакансий после сжатия.
+        """
+        serializer = detect_serializer(self.file_json)
+        if serializer is None:
+            return 0
+        keys = {}
+
+        def records():
+            for vacancy in self.iter_load():
+                key = vacancy.dedup_key
+                if key not in keys:
+                    keys[key] = None
+                    yield vacancy.to_dict()
+
+        tmp_file = f"{self.file_json}.tmp"
+        serializer.dump(records(), tmp_file)
+        os.replace(tmp_file, self.file_json)
+        invalidate_path(self.file_json)
+        index = IdIndex(f"{self.file_json}.ids", self.file_json)
+        index.rebuild(keys)
+        index.close()
+        return len(keys)
+
+    def iter_lazy(self, chunk_size=65536):
+        """
+        Потоковая загрузка записей в виде LazyVacancy: поля вакансии
+        разбираются только при обращении к ним. Подходит для проходов
+        по файлу, которым нужны только зарплата или дата, например топ-N
+        (см. замер "get_top_n_vacancies (iter_lazy)" в benchmarks.run).
+
+        :param chunk_size: Размер читаемой за раз части файла.
+        :return: Генератор объектов LazyVacancy.
+        """
+        serializer = detect_serializer(self.file_json)
+        if serializer is None:
+            return
+        try:
+            for item in serializer.iter_load(self.file_json, chunk_size):
+                yield LazyVacancy(item)
+        except ValueError as e:
+            print(f"Ошибка декодирования файла: {e}")
+
+    @staticmethod
+    def iter_json_array(file, chunk_size=65536):
+        """
+        Инкрементальный разбор JSON-массива верхнего уровня.
+
+        :param file: Открытый текстовый файл.
+        :param chunk_size: Размер читаемой за раз части файла в символах.
+        :return: Генератор элементов массива.
+        """
+        return iter_json_array(file, chunk_size)
 
     @staticmethod
     def clear_data():
@@ -100,6 +208,7 @@ class FileWorker:
             try:
                 with open(file_json, "w", encoding="utf-8") as file:
                     json.dump([], file)
+                invalidate_path(file_json)
                 print("Все данные из файла успешно удалены.")
             except Exception as e:
                 print(f"Ошибка при удалении данных: {e}")
@@ -122,3 +231,18 @@ class FileWorker:
             except ValueError:
                 return 0
         return salary if salary is not None else 0
+
+
+class JsonLinesFileWorker(FileWorker):
+    """
+    Хранилище вакансий в формате JSON Lines, работающее только на дозапись:
+    FileWorker с форматом jsonl. Повторы отсекаются тем же индексом IdIndex
+    (<file_jsonl>.ids), что и в FileWorker, повреждённые строки при загрузке
+    пропускаются.
+
+    :param file_jsonl: Путь к файлу JSON Lines.
+    """
+
+    def __init__(self, file_jsonl):
+        super().__init__(file_jsonl, "jsonl")
+        self.file_jsonl = file_jsonl
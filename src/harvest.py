@@ -0,0 +1,76 @@
+"""
+Пакетный сбор вакансий без ввода с клавиатуры.
+
+Запуск: python -m src.harvest queries.txt
+Каждая строка файла запросов - "город;ключевое слово", пустые строки
+и строки, начинающиеся с #, пропускаются.
+Флаги --only-with-salary и --period N сужают выдачу на стороне hh.ru.
+"""
+
+import argparse
+
+from config import file_json, http_cache_dir
+from src.fileworker import FileWorker
+from src.hh import HHAPI
+from src.http_cache import ResponseCache
+from src.metrics import enable_from_env, metrics
+
+
+def read_queries(path):
+    """
+    Чтение списка запросов из файла.
+
+    :param path: Путь к файлу запросов.
+    :return: Список пар (город, ключевое слово).
+    """
+    queries = []
+    with open(path, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            city, separator, keyword = line.partition(";")
+            if not separator or not city.strip() or not keyword.strip():
+                print(f"Строка {number} пропущена: ожидается 'город;ключевое слово'.")
+                continue
+            queries.append((city.strip(), keyword.strip()))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный сбор вакансий с hh.ru")
+    parser.add_argument("queries", help="файл со строками 'город;ключевое слово'")
+    parser.add_argument("--output", default=file_json, help="JSON-файл хранилища")
+    parser.add_argument(
+        "--parallel", type=int, default=4, help="число одновременных запросов"
+    )
+    parser.add_argument(
+        "--only-with-salary",
+        action="store_true",
+        help="только вакансии с указанной зарплатой",
+    )
+    parser.add_argument(
+        "--period", type=int, help="искать за последние N дней публикации"
+    )
+    args = parser.parse_args()
+    metrics_path = enable_from_env()
+
+    queries = read_queries(args.queries)
+    if not queries:
+        print("Нет запросов для выполнения.")
+        return
+    hhapi = HHAPI(response_cache=ResponseCache(http_cache_dir))
+    hhapi.update_currency_rates()
+    hhapi.harvest(
+        queries,
+        FileWorker(args.output),
+        max_queries=args.parallel,
+        only_with_salary=args.only_with_salary,
+        period=args.period,
+    )
+    if metrics_path:
+        metrics.export(metrics_path)
+
+
+if __name__ == "__main__":
+    main()
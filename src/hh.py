@@ -1,11 +1,19 @@
+import json
+import os
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Optional
 
 import requests
 
-from config import file_json
+from config import areas_json, file_json, harvest_checkpoint
 from src.fileworker import FileWorker
+from src.metrics import metrics
+from src.pipeline import HarvestPipeline
+from src.salary import rates
+from src.scheduler import RequestScheduler
 from src.vacancy import Vacancy
 
 
@@ -22,28 +30,123 @@ class AbstractJobAPI(ABC):
         pass
 
 
+AREAS_TTL = 24 * 60 * 60
+# курсы валют hh.ru обновляет чаще, чем справочник регионов
+CURRENCY_TTL = 6 * 60 * 60
+# время ожидания соединения и ответа в секундах, чтобы запрос не зависал
+REQUEST_TIMEOUT = (5, 30)
+# hh.ru отдаёт не больше 100 вакансий на страницу и не больше 2000 по запросу
+PER_PAGE = 100
+MAX_RESULTS = 2000
+# ключевое слово ищется там же, где его проверяет parse_item:
+# в названии и в описании вакансии
+SEARCH_FIELDS = ("name", "description")
+
+
 class HHAPI(AbstractJobAPI):
     """Класс для выполнения API запроса"""
 
-    def __init__(self):
+    _area_indexes: dict = {}
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        areas_cache=areas_json,
+        areas_ttl: int = AREAS_TTL,
+        currency_ttl: int = CURRENCY_TTL,
+        response_cache=None,
+        scheduler=None,
+        timeout=REQUEST_TIMEOUT,
+    ):
         self.url = "https://api.hh.ru/vacancies"
         self.headers = {"User-Agent": "Your User Agent"}
         self.vacancies = []
-        self.params = {"text": "", "area": "", "page": 0, "per_page": 20}
+        self.params = {
+            "text": "",
+            "area": "",
+            "page": 0,
+            "per_page": PER_PAGE,
+            "search_field": list(SEARCH_FIELDS),
+        }
+        self.pages = MAX_RESULTS // PER_PAGE
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.areas_cache = areas_cache
+        self.areas_ttl = areas_ttl
+        self.currency_ttl = currency_ttl
+        self.response_cache = response_cache
+        self.timeout = timeout
+        self.scheduler = (
+            scheduler
+            if scheduler is not None
+            else RequestScheduler(max_concurrency=max_workers)
+        )
 
         super().__init__()
 
     def get_area_id(self, city: str) -> Optional[Any]:
         """Получаем ID региона по названию города"""
+        index = self.get_area_index()
+        if index is None:
+            return None
+        return index.get(city.casefold())
+
+    def get_area_index(self) -> Optional[dict]:
+        """Плоский словарь "название города -> ID", общий для всех экземпляров"""
+        key = os.fspath(self.areas_cache)
+        cached = self._area_indexes.get(key)
+        if cached is not None and time.time() - cached[0] < self.areas_ttl:
+            return cached[1]
+
+        areas = self.load_areas()
+        if areas is None:
+            return None
+        index = self.build_area_index(areas)
+        self._area_indexes[key] = (time.time(), index)
+        return index
+
+    def load_areas(self) -> Optional[list]:
+        """Дерево регионов из файлового кэша, а при его устаревании - с сайта hh.ru"""
+        if (
+            os.path.exists(self.areas_cache)
+            and time.time() - os.path.getmtime(self.areas_cache) < self.areas_ttl
+        ):
+            try:
+                with open(self.areas_cache, "r", encoding="utf-8") as file:
+                    return json.load(file)
+            except (OSError, json.JSONDecodeError):
+                pass
+
         url = "https://api.hh.ru/areas"
-        response = requests.get(url)
+        response = self.session.get(url, timeout=self.timeout)
 
         if response.status_code != 200:
             print("Ошибка при получении данных:", response.status_code)
             return None
 
         areas = response.json()
-        return self.find_area_id(areas, city)
+        try:
+            with open(self.areas_cache, "w", encoding="utf-8") as file:
+                json.dump(areas, file, ensure_ascii=False)
+        except OSError as e:
+            print(f"Не удалось сохранить кэш регионов: {e}")
+        return areas
+
+    @staticmethod
+    def build_area_index(areas) -> dict:
+        """Обход дерева регионов в том же порядке, что и find_area_id.
+        При совпадении названий сохраняется первый найденный регион."""
+        index = {}
+        stack = list(reversed(areas))
+        while stack:
+            area = stack.pop()
+            if not isinstance(area, dict):
+                continue
+            index.setdefault(area["name"].casefold(), area["id"])
+            if area.get("areas"):
+                stack.extend(reversed(area["areas"]))
+        return index
 
     def find_area_id(self, areas, city: str) -> Optional[Any]:
         """Получаем ID города"""
@@ -57,12 +160,46 @@ class HHAPI(AbstractJobAPI):
                         return found_id
         return None
 
+    def update_currency_rates(self) -> dict:
+        """Курсы валют из справочника hh.ru для перевода зарплат в рубли.
+        Сохранённые курсы обновляются не чаще, чем раз в currency_ttl секунд"""
+        cache = rates.cache_file
+        if (
+            os.path.exists(cache)
+            and time.time() - os.path.getmtime(cache) < self.currency_ttl
+        ):
+            return rates.table()
+
+        response = self.session.get(
+            "https://api.hh.ru/dictionaries", timeout=self.timeout
+        )
+        if response.status_code != 200:
+            print("Ошибка при получении курсов валют:", response.status_code)
+            return rates.table()
+        currencies = response.json().get("currency")
+        if not isinstance(currencies, list):
+            return rates.table()
+        return rates.update(currencies)
+
     def get_valid_input(self):
         """ВВод данных с клавиатуры"""
         city = self.get_non_empty_input("Введите город: ")
         keyword = self.get_non_empty_input("Введите вакансию: ")
         return city, keyword
 
+    def get_search_filters(self):
+        """Ввод фильтров выдачи hh.ru: только с зарплатой и период в днях"""
+        answer = input("Только вакансии с указанной зарплатой? (да/нет): ")
+        only_with_salary = answer.strip().lower() in ("да", "д", "yes", "y")
+        while True:
+            period = input("За сколько последних дней искать (пусто - за всё время): ")
+            period = period.strip()
+            if not period:
+                return only_with_salary, None
+            if period.isdigit() and int(period) > 0:
+                return only_with_salary, int(period)
+            print("Ошибка: Введите положительное число дней или оставьте пустым.")
+
     @staticmethod
     def get_non_empty_input(prompt):
         """Проверка вводимых данных на пустую строку"""
@@ -72,59 +209,140 @@ class HHAPI(AbstractJobAPI):
             user_input = input(prompt).strip()
         return user_input
 
-    def fetch_and_save_vacancies(self):
-        """Получение вакансий по API-запросу с сайта hh.ru и сохранение их в json-файл"""
-        city, keyword = self.get_valid_input()
-        self.params["area"] = self.get_area_id(city)
-        self.params["text"] = keyword
-        found_vacancies = []
-        while self.params["page"] < 20:
-            response = requests.get(self.url, headers=self.headers, params=self.params)
-            if response.status_code == 200:
-                vacancies = response.json().get("items", [])
-                for item in vacancies:
-                    if item is None:
-                        continue
-
-                    name_contains_query = keyword.lower() in item["name"].lower()
-                    requirement_contains_query = (
-                        item["snippet"].get("requirement")
-                        and keyword.lower() in item["snippet"]["requirement"].lower()
+    def fetch_page(self, page: int, params=None):
+        """Запрос одной страницы вакансий через общую keep-alive сессию.
+        Повторы и темп запросов определяет планировщик."""
+        params = dict(params if params is not None else self.params, page=page)
+        with metrics.stage("fetch"):
+            if self.response_cache is not None:
+                response = self.scheduler.request(
+                    lambda: self.response_cache.get(
+                        self.session, self.url, params=params, timeout=self.timeout
+                    )
+                )
+            else:
+                response = self.scheduler.request(
+                    lambda: self.session.get(
+                        self.url, params=params, timeout=self.timeout
                     )
+                )
+        if metrics.enabled:
+            metrics.count("pages")
+            metrics.count("bytes", len(response.content))
+        return response
 
-                    if name_contains_query or requirement_contains_query:
-                        salary_info = item.get("salary")
-                        salary_value = salary_info.get("from", 0) if salary_info else 0
-
-                        description = item["snippet"].get("requirement", "")
-                        if not isinstance(description, str):
-                            description = ""
-
-                        published_at_raw = item.get("published_at", "")
-                        if published_at_raw:
-                            try:
-                                published_at = datetime.strptime(
-                                    published_at_raw, "%Y-%m-%dT%H:%M:%S%z"
-                                ).strftime("%d.%m.%Y")
-                            except ValueError:
-                                published_at = None
-                        else:
-                            published_at = None
-
-                        vacancy = Vacancy(
-                            title=item["name"],
-                            published_at=published_at,
-                            city=item.get("area", {}).get("name"),
-                            salary=salary_value,
-                            description=description,
-                            url=item["alternate_url"],
-                        )
-                        found_vacancies.append(vacancy)
+    def fetch_pages(self, params=None):
+        """Запрос страниц выдачи с сохранением их порядка.
+        Сначала запрашивается первая страница: по её полю pages видно, сколько
+        страниц есть на самом деле, и только они запрашиваются параллельно"""
+        params = params if params is not None else self.params
+        first_response = self.fetch_page(params["page"], params)
+        if first_response.status_code != 200:
+            return [first_response]
 
-                self.params["page"] += 1
-            else:
+        last_page = min(self.count_pages(first_response), self.pages)
+        pages = range(params["page"] + 1, last_page)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [first_response] + list(
+                executor.map(lambda page: self.fetch_page(page, params), pages)
+            )
+
+    def count_pages(self, response) -> int:
+        """Число страниц выдачи из ответа API или self.pages, если его там нет"""
+        try:
+            pages = response.json().get("pages")
+        except (ValueError, AttributeError):
+            return self.pages
+        return pages if isinstance(pages, int) else self.pages
+
+    @staticmethod
+    def parse_item(item, keyword: str) -> Optional[Vacancy]:
+        """Преобразование элемента ответа API в вакансию, если он подходит под запрос.
+        Ключевое слово передаётся уже в нижнем регистре"""
+        if item is None:
+            return None
+
+        name_contains_query = keyword in item["name"].lower()
+        requirement_contains_query = (
+            item["snippet"].get("requirement")
+            and keyword in item["snippet"]["requirement"].lower()
+        )
+        if not (name_contains_query or requirement_contains_query):
+            return None
+
+        salary_info = item.get("salary") or {}
+        salary_value = salary_info.get("from")
+
+        description = item["snippet"].get("requirement", "")
+        if not isinstance(description, str):
+            description = ""
+
+        published_at_raw = item.get("published_at", "")
+        if published_at_raw:
+            try:
+                published_at = datetime.strptime(
+                    published_at_raw, "%Y-%m-%dT%H:%M:%S%z"
+                ).strftime("%d.%m.%Y")
+            except ValueError:
+                published_at = None
+        else:
+            published_at = None
+
+        return Vacancy(
+            title=item["name"],
+            published_at=published_at,
+            city=item.get("area", {}).get("name"),
+            salary=salary_value,
+            description=description,
+            url=item["alternate_url"],
+            salary_to=salary_info.get("to"),
+            currency=salary_info.get("currency"),
+        )
+
+    def build_params(
+        self,
+        city: str,
+        keyword: str,
+        only_with_salary: bool = False,
+        period: Optional[int] = None,
+    ) -> dict:
+        """Параметры запроса вакансий. Собираются заново, self.params не изменяется"""
+        params = dict(self.params, area=self.get_area_id(city), text=keyword)
+        if only_with_salary:
+            params["only_with_salary"] = "true"
+        if period:
+            params["period"] = period
+        return params
+
+    def fetch_vacancies(
+        self,
+        city: str,
+        keyword: str,
+        only_with_salary: bool = False,
+        period: Optional[int] = None,
+    ):
+        """Получение вакансий по городу и ключевому слову без ввода с клавиатуры.
+        only_with_salary и period (число дней) сужают выдачу на стороне hh.ru"""
+        params = self.build_params(city, keyword, only_with_salary, period)
+        keyword = keyword.lower()
+        found_vacancies = []
+        for response in self.fetch_pages(params):
+            if response.status_code != 200:
                 print(f"Ошибка запроса: {response.status_code}")
                 break
+            with metrics.stage("parse"):
+                items = response.json().get("items", [])
+                metrics.count("items", len(items))
+                for item in items:
+                    vacancy = self.parse_item(item, keyword)
+                    if vacancy is not None:
+                        found_vacancies.append(vacancy)
+        return found_vacancies
+
+    def fetch_and_save_vacancies(self):
+        """Получение вакансий по API-запросу с сайта hh.ru и сохранение их в json-файл"""
+        city, keyword = self.get_valid_input()
+        found_vacancies = self.fetch_vacancies(city, keyword)
 
         storage = FileWorker(file_json)
         storage.save(found_vacancies)
@@ -137,5 +355,116 @@ class HHAPI(AbstractJobAPI):
             )
         else:
             print("Нет вакансий по запросу.")
+        self.print_cache_stats()
 
         return found_vacancies
+
+    def stream_vacancies(
+        self,
+        city: str,
+        keyword: str,
+        storage=None,
+        checkpoint_file=harvest_checkpoint,
+        batch_size: int = 200,
+        only_with_salary: bool = False,
+        period: Optional[int] = None,
+    ) -> int:
+        """
+        Потоковый сбор вакансий с сохранением партиями и контрольной точкой,
+        см. HarvestPipeline. Найденные вакансии не накапливаются в памяти.
+
+        :param city: Город.
+        :param keyword: Ключевое слово.
+        :param storage: Хранилище; по умолчанию FileWorker(file_json).
+        :param checkpoint_file: Файл контрольной точки или None.
+        :param batch_size: Число вакансий в одной сохраняемой партии.
+        :return: Количество найденных вакансий.
+        """
+        params = self.build_params(city, keyword, only_with_salary, period)
+        storage = storage if storage is not None else FileWorker(file_json)
+        pipeline = HarvestPipeline(self, storage, checkpoint_file, batch_size)
+        return pipeline.run(params, keyword.lower())
+
+    def stream_and_save_vacancies(self, storage=None):
+        """Потоковое получение вакансий с сайта hh.ru по запросу с клавиатуры.
+        Кроме города и вакансии запрашиваются фильтры only_with_salary и period.
+        Прерванный сбор с тем же запросом продолжается с последней сохранённой страницы.
+        По умолчанию вакансии сохраняются в FileWorker(file_json)
+        """
+        city, keyword = self.get_valid_input()
+        only_with_salary, period = self.get_search_filters()
+        self.update_currency_rates()
+        found = self.stream_vacancies(
+            city,
+            keyword,
+            storage,
+            only_with_salary=only_with_salary,
+            period=period,
+        )
+
+        if found:
+            print(
+                f"Найдено {found} вакансий по запросу '{keyword.capitalize()}'"
+                f" в г. {city.capitalize()}.\n"
+                f"Они успешно сохранены."
+            )
+        else:
+            print("Нет вакансий по запросу.")
+        self.print_cache_stats()
+        return found
+
+    def harvest(
+        self,
+        queries,
+        storage=None,
+        max_queries: int = 4,
+        only_with_salary: bool = False,
+        period: Optional[int] = None,
+    ):
+        """
+        Пакетный сбор вакансий по нескольким парам (город, ключевое слово).
+        Запросы выполняются параллельно через общую сессию и общий индекс
+        регионов, вакансии из разных запросов объединяются без повторов
+        по идентификатору hh.ru
+        и сохраняются одной записью в хранилище.
+
+        :param queries: Список пар (город, ключевое слово).
+        :param storage: Хранилище; по умолчанию FileWorker(file_json).
+        :param max_queries: Число одновременно выполняемых запросов.
+        :param only_with_salary: Только вакансии с указанной зарплатой.
+        :param period: Число последних дней публикации или None.
+        :return: Список уникальных найденных вакансий.
+        """
+        self.get_area_index()
+        with ThreadPoolExecutor(max_workers=max_queries) as executor:
+            results = list(
+                executor.map(
+                    lambda query: self.fetch_vacancies(
+                        *query, only_with_salary=only_with_salary, period=period
+                    ),
+                    queries,
+                )
+            )
+
+        found_vacancies = []
+        seen_keys = set()
+        for (city, keyword), vacancies in zip(queries, results):
+            print(f"{keyword} в г. {city}: найдено {len(vacancies)} вакансий.")
+            for vacancy in vacancies:
+                if vacancy.dedup_key not in seen_keys:
+                    seen_keys.add(vacancy.dedup_key)
+                    found_vacancies.append(vacancy)
+
+        storage = storage if storage is not None else FileWorker(file_json)
+        storage.save(found_vacancies)
+        print(f"Всего уникальных вакансий: {len(found_vacancies)}.")
+        self.print_cache_stats()
+        return found_vacancies
+
+    def print_cache_stats(self):
+        """Вывод счётчиков кэша запросов, если он используется"""
+        if self.response_cache is not None:
+            stats = self.response_cache.stats()
+            print(
+                f"Кэш запросов: попаданий {stats['hits']}, промахов {stats['misses']}."
+            )
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from src.metrics import metrics
+
+
+class CachedResponse:
+    """
+    Ответ, восстановленный из кэша. Повторяет ту часть интерфейса
+    requests.Response, которой пользуется HHAPI.
+    """
+
+    from_cache = True
+
+    def __init__(self, entry):
+        self.status_code = entry["status_code"]
+        self.text = entry["text"]
+        self.headers = entry.get("headers", {})
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ResponseCache:
+    """
+    Файловый кэш ответов API, ключ - URL и параметры запроса.
+    Если сервер прислал ETag или Last-Modified, ответ перепроверяется условным
+    запросом; иначе он считается актуальным в течение ttl секунд.
+
+    :param cache_dir: Каталог для файлов кэша.
+    :param ttl: Время жизни ответа без валидаторов, в секундах.
+    """
+
+    def __init__(self, cache_dir, ttl=3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Ключ кэша по URL и параметрам запроса."""
+        raw = json.dumps([url, params or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write(self, key, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Не удалось сохранить ответ в кэш: {e}")
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        metrics.count(f"cache_{name}")
+
+    def get(self, session, url, params=None, **kwargs):
+        """
+        GET-запрос через кэш.
+
+        :param session: Сессия requests, через которую выполняется запрос.
+        :param url: Адрес запроса.
+        :param params: Параметры запроса.
+        :return: Ответ сервера или CachedResponse.
+        """
+        key = self.make_key(url, params)
+        entry = self._read(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+
+        if entry is not None:
+            has_validators = entry.get("etag") or entry.get("last_modified")
+            if not has_validators and time.time() - entry["stored_at"] < self.ttl:
+                self._count("hits")
+                return CachedResponse(entry)
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._count("hits")
+            self._count("revalidated")
+            entry["stored_at"] = time.time()
+            self._write(key, entry)
+            return CachedResponse(entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._write(
+                key,
+                {
+                    "status_code": response.status_code,
+                    "text": response.text,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "stored_at": time.time(),
+                },
+            )
+        return response
+
+    def stats(self):
+        """Счётчики попаданий и промахов кэша."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
@@ -0,0 +1,404 @@
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+TOKEN_RE = re.compile(r"\w+")
+_UNTYPED = object()
+
+
+def file_version(path):
+    """
+    Версия файла хранилища: время изменения и размер.
+
+    :param path: Путь к файлу.
+    :return: Список [mtime_ns, size] или None, если файла нет.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class KeywordIndex:
+    """
+    Инвертированный индекс слов из названий и описаний вакансий.
+    Для каждого слова хранится отсортированный список позиций вакансий.
+
+    :param postings: Словарь "слово -> список позиций".
+    :param size: Количество проиндексированных вакансий.
+    :param version: Версия файла хранилища, по которому построен индекс.
+    """
+
+    def __init__(self, postings=None, size=0, version=None):
+        self.postings = postings if postings is not None else {}
+        self.size = size
+        self.version = version
+
+    @staticmethod
+    def vacancy_text(vacancy):
+        """Текст вакансии, по которому выполняется поиск."""
+        return f"{vacancy.title} {vacancy.description}".lower()
+
+    @classmethod
+    def build(cls, vacancies, version=None):
+        """
+        Построение индекса по вакансиям.
+
+        :param vacancies: Последовательность вакансий.
+        :param version: Версия файла хранилища.
+        :return: Объект KeywordIndex.
+        """
+        postings = {}
+        size = 0
+        for position, vacancy in enumerate(vacancies):
+            for token in set(TOKEN_RE.findall(cls.vacancy_text(vacancy))):
+                postings.setdefault(token, []).append(position)
+            size = position + 1
+        return cls(postings, size, version)
+
+    @classmethod
+    def for_file(cls, storage_file, vacancies):
+        """
+        Индекс для файла хранилища. Берётся из файла <storage_file>.kwindex,
+        если он построен для текущей версии хранилища, иначе строится заново
+        и сохраняется.
+
+        :param storage_file: Путь к файлу хранилища.
+        :param vacancies: Вакансии, загруженные из этого файла.
+        :return: Объект KeywordIndex.
+        """
+        index_file = f"{storage_file}.kwindex"
+        version = file_version(storage_file)
+        index = cls.load(index_file)
+        if (
+            index is not None
+            and index.version == version
+            and index.size == len(vacancies)
+        ):
+            return index
+
+        index = cls.build(vacancies, version)
+        index.dump(index_file)
+        return index
+
+    @classmethod
+    def load(cls, index_file):
+        """Загрузка индекса из файла или None, если файл отсутствует или повреждён."""
+        try:
+            with open(index_file, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            return cls(data["postings"], data["size"], data["version"])
+        except (OSError, KeyError, TypeError, json.JSONDecodeError):
+            return None
+
+    def dump(self, index_file):
+        """Сохранение индекса в файл."""
+        try:
+            with open(index_file, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "version": self.version,
+                        "size": self.size,
+                        "postings": self.postings,
+                    },
+                    file,
+                    ensure_ascii=False,
+                )
+        except OSError as e:
+            print(f"Не удалось сохранить индекс: {e}")
+
+    def _positions(self, token):
+        """Позиции вакансий, в тексте которых есть слово, содержащее token."""
+        exact = self.postings.get(token)
+        positions = set(exact) if exact else set()
+        for word, word_positions in self.postings.items():
+            if token in word and word != token:
+                positions.update(word_positions)
+        return positions
+
+    def search(self, words, vacancies):
+        """
+        Поиск вакансий, в тексте которых встречаются все слова.
+        Слово ищется как подстрока, как и при обычном переборе.
+
+        :param words: Слова запроса.
+        :param vacancies: Последовательность вакансий, по которой построен индекс.
+        :return: Список подходящих вакансий в исходном порядке.
+        """
+        words = [word.lower() for word in words if word]
+        tokens = {token for word in words for token in TOKEN_RE.findall(word)}
+        candidates = None
+        for token in sorted(tokens, key=len, reverse=True):
+            positions = self._positions(token)
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+
+        if candidates is None:
+            candidates = range(self.size)
+        to_check = [word for word in words if not TOKEN_RE.fullmatch(word)]
+        result = []
+        for position in sorted(candidates):
+            vacancy = vacancies[position]
+            if to_check:
+                text = self.vacancy_text(vacancy)
+                if not all(word in text for word in to_check):
+                    continue
+            result.append(vacancy)
+        return result
+
+
+class SalaryIndex:
+    """
+    Индекс вакансий по зарплате: отсортированный массив зарплат
+    и соответствующие им позиции вакансий.
+
+    :param salaries: Отсортированный список зарплат.
+    :param positions: Позиции вакансий в том же порядке.
+    """
+
+    def __init__(self, salaries=None, positions=None):
+        self.salaries = salaries if salaries is not None else []
+        self.positions = positions if positions is not None else []
+
+    @staticmethod
+    def salary_of(vacancy):
+        """
+        Числовая зарплата вакансии: значение в рублях salary_rub,
+        а для объектов без него - разобранное поле salary.
+
+        :param vacancy: Вакансия.
+        :return: Число или None, если зарплату не удалось определить.
+        """
+        salary_rub = getattr(vacancy, "salary_rub", _UNTYPED)
+        if salary_rub is None or type(salary_rub) is int:
+            return salary_rub
+        salary = vacancy.salary
+        if isinstance(salary, str):
+            salary = re.sub(r"[^\d]", "", salary)
+            return int(salary) if salary.isdigit() else None
+        if isinstance(salary, (int, float)) and not isinstance(salary, bool):
+            return salary
+        return None
+
+    @classmethod
+    def build(cls, vacancies):
+        """
+        Построение индекса по вакансиям.
+
+        :param vacancies: Последовательность вакансий.
+        :return: Объект SalaryIndex.
+        """
+        pairs = []
+        for position, vacancy in enumerate(vacancies):
+            salary = cls.salary_of(vacancy)
+            if salary is not None:
+                pairs.append((salary, position))
+        pairs.sort()
+        return cls([salary for salary, _ in pairs], [position for _, position in pairs])
+
+    def range(self, min_salary, max_salary):
+        """
+        Позиции вакансий с зарплатой в диапазоне [min_salary, max_salary]
+        в порядке возрастания зарплаты.
+        """
+        low = bisect_left(self.salaries, min_salary)
+        high = bisect_right(self.salaries, max_salary)
+        return self.positions[low:high]
+
+    def search(self, min_salary, max_salary, vacancies):
+        """Вакансии с зарплатой в заданном диапазоне по возрастанию зарплаты."""
+        return [vacancies[position] for position in self.range(min_salary, max_salary)]
+
+
+class DateIndex:
+    """
+    Индекс вакансий по дате публикации: отсортированные порядковые номера дней
+    (date.toordinal) и соответствующие им позиции вакансий.
+
+    :param ordinals: Отсортированный список дат публикации.
+    :param positions: Позиции вакансий в том же порядке.
+    """
+
+    def __init__(self, ordinals=None, positions=None):
+        self.ordinals = ordinals if ordinals is not None else []
+        self.positions = positions if positions is not None else []
+
+    @classmethod
+    def build(cls, vacancies):
+        """
+        Построение индекса по вакансиям.
+
+        :param vacancies: Последовательность вакансий.
+        :return: Объект DateIndex.
+        """
+        pairs = sorted(
+            (vacancy.published_ord, position)
+            for position, vacancy in enumerate(vacancies)
+        )
+        return cls(
+            [ordinal for ordinal, _ in pairs], [position for _, position in pairs]
+        )
+
+    def ordered(self, vacancies, reverse=False):
+        """
+        Вакансии, упорядоченные по дате. При reverse=True - от новых к старым,
+        вакансии с одинаковой датой остаются в исходном порядке.
+        """
+        if not reverse:
+            return [vacancies[position] for position in self.positions]
+        result = []
+        end = len(self.ordinals)
+        while end > 0:
+            start = bisect_left(self.ordinals, self.ordinals[end - 1], 0, end)
+            result.extend(vacancies[position] for position in self.positions[start:end])
+            end = start
+        return result
+
+    def range(self, date_from, date_to):
+        """
+        Позиции вакансий, опубликованных с date_from по date_to включительно.
+
+        :param date_from: Начальная дата (date или порядковый номер дня).
+        :param date_to: Конечная дата (date или порядковый номер дня).
+        :return: Список позиций по возрастанию даты.
+        """
+        if isinstance(date_from, date):
+            date_from = date_from.toordinal()
+        if isinstance(date_to, date):
+            date_to = date_to.toordinal()
+        low = bisect_left(self.ordinals, date_from)
+        high = bisect_right(self.ordinals, date_to)
+        return self.positions[low:high]
+
+
+class IdIndex:
+    """
+    Сохраняемый на диск индекс уникальных ключей вакансий (Vacancy.dedup_key).
+    Файл состоит из заголовка, отсортированного массива ключей и журнала ключей,
+    добавленных после последнего слияния. Отсортированная часть читается через
+    mmap и проверяется двоичным поиском, поэтому при сохранении не нужно
+    загружать все ключи. Журнал сливается с основной частью, когда вырастает.
+
+    :param path: Путь к файлу индекса.
+    :param data_file: Файл хранилища, для которого построен индекс.
+    """
+
+    HEADER = struct.Struct("=3Q")
+    MIN_LOG_SIZE = 1024
+
+    def __init__(self, path, data_file):
+        self.path = path
+        self.data_file = data_file
+        self.sorted_count = 0
+        self.log = set()
+        self._file = None
+        self._mmap = None
+        self._view = None
+        self._sorted = []
+
+    def open(self):
+        """
+        Открытие индекса.
+
+        :return: True, если индекс существует и построен для текущей версии
+            файла хранилища, иначе False.
+        """
+        self.close()
+        try:
+            self._file = open(self.path, "rb")
+        except OSError:
+            return False
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.HEADER.size or (size - self.HEADER.size) % 8:
+            self.close()
+            return False
+        count, data_size, data_mtime = self.HEADER.unpack(
+            self._file.read(self.HEADER.size)
+        )
+        sorted_end = self.HEADER.size + count * 8
+        if sorted_end > size or file_version(self.data_file) != [data_mtime, data_size]:
+            self.close()
+            return False
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sorted = self._view[self.HEADER.size : sorted_end].cast("Q")
+        self.sorted_count = count
+        self.log = set(array("Q", self._mmap[sorted_end:]))
+        return True
+
+    def close(self):
+        """Освобождение отображения файла в память."""
+        if isinstance(self._sorted, memoryview):
+            self._sorted.release()
+        self._sorted = []
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __contains__(self, key):
+        if key in self.log:
+            return True
+        position = bisect_left(self._sorted, key)
+        return position < self.sorted_count and self._sorted[position] == key
+
+    def __len__(self):
+        return self.sorted_count + len(self.log)
+
+    def _write(self, keys):
+        """Запись всех ключей в отсортированную часть нового файла индекса."""
+        sorted_keys = array("Q", sorted(set(keys)))
+        version = file_version(self.data_file) or [0, 0]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(self.HEADER.pack(len(sorted_keys), version[1], version[0]))
+            sorted_keys.tofile(file)
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self, keys):
+        """
+        Построение индекса заново.
+
+        :param keys: Ключи всех вакансий хранилища.
+        """
+        self.close()
+        self._write(keys)
+        self.open()
+
+    def add(self, keys):
+        """
+        Добавление ключей новых вакансий. Вызывается после записи вакансий
+        в хранилище, чтобы индекс запомнил новую версию файла.
+
+        :param keys: Ключи, которых ещё нет в индексе.
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        if len(self.log) + len(keys) > max(self.MIN_LOG_SIZE, self.sorted_count // 8):
+            all_keys = list(self._sorted) + list(self.log) + keys
+            self.rebuild(all_keys)
+            return
+
+        self.close()
+        version = file_version(self.data_file) or [0, 0]
+        with open(self.path, "r+b") as file:
+            header = self.HEADER.unpack(file.read(self.HEADER.size))
+            file.seek(0)
+            file.write(self.HEADER.pack(header[0], version[1], version[0]))
+            file.seek(0, os.SEEK_END)
+            array("Q", keys).tofile(file)
+        self.open()
@@ -1,13 +1,47 @@
-from config import file_json
+import os
+
+from config import file_json, http_cache_dir, records_file, vacancies_db
 from src.fileworker import FileWorker
 from src.hh import HHAPI
+from src.http_cache import ResponseCache
+from src.metrics import enable_from_env, metrics
+from src.recordstore import RecordStore
+from src.session import DatasetCache
+from src.sqliteworker import SQLiteWorker
 from src.vacancy import Vacancy
 
+BACKEND_ENV = "VACANCY_BACKEND"
+
+
+def open_storage():
+    """
+    Хранилище вакансий, выбранное переменной окружения VACANCY_BACKEND:
+    json (по умолчанию) - файл file_json, sqlite - база vacancies_db.
+
+    :return: Кортеж (хранилище, путь к его файлу).
+    """
+    backend = os.environ.get(BACKEND_ENV, "json")
+    if backend == "sqlite":
+        return SQLiteWorker(vacancies_db), vacancies_db
+    if backend != "json":
+        print(f"Неизвестное хранилище '{backend}', используется json.")
+    return FileWorker(file_json), file_json
+
 
 def main():
-    """Функция взаимодействия с пользователем"""
-    file_worker = FileWorker(file_json)
-    file_worker.load()
+    """Функция взаимодействия с пользователем.
+    Если задана переменная окружения VACANCY_METRICS, после каждого действия
+    в указанный файл записывается отчёт с метриками.
+    Переменная VACANCY_BACKEND=sqlite включает хранение вакансий в SQLite:
+    тогда отбор, сортировка и топ-N выполняются запросами к базе, а для json -
+    по колоночной таблице VacancyTable"""
+    metrics_path = enable_from_env()
+    storage, storage_file = open_storage()
+    use_sql = isinstance(storage, SQLiteWorker)
+    dataset = DatasetCache(storage, storage_file)
+    if not use_sql:
+        dataset.get_vacancies()
+    response_cache = ResponseCache(http_cache_dir)
     while True:
         choice = input(
             "1. Смотреть вакансии из файла\n"
@@ -18,39 +52,63 @@ def main():
             "6. Сортировка вакансий по строке поиска\n"
             "7. Сортировка вакансий по дате\n"
             "8. Выход\n"
+            "9. Смотреть страницу вакансий из файла\n"
             "Выберите действие: "
         )
         if choice == "1":
-            file_worker = FileWorker(file_json)
-            vacancies = file_worker.load()
-            Vacancy.print_vacancies(vacancies)
+            Vacancy.print_vacancies(
+                storage.iter_load() if use_sql else dataset.get_vacancies()
+            )
         elif choice == "2":
-            hhapi_instance = HHAPI()
-            hhapi_instance.fetch_and_save_vacancies()
+            hhapi_instance = HHAPI(response_cache=response_cache)
+            hhapi_instance.stream_and_save_vacancies(storage)
         elif choice == "3":
-            file_worker = FileWorker(file_json)
-            vacancies = file_worker.load()
-            Vacancy.display_top_n_vacancies(vacancies)
+            if use_sql:
+                Vacancy.display_top_n_vacancies(storage)
+            else:
+                Vacancy.display_top_n_vacancies(dataset.table(), dataset.query_cache)
         elif choice == "4":
-            FileWorker.clear_data()
+            if use_sql:
+                storage.clear_data()
+            else:
+                FileWorker.clear_data()
         elif choice == "5":
-            file_worker = FileWorker(file_json)
-            vacancies = file_worker.load()
-            Vacancy.filter_vacancies_by_salary(vacancies)
+            if use_sql:
+                Vacancy.filter_vacancies_by_salary(storage)
+            else:
+                Vacancy.filter_vacancies_by_salary(
+                    dataset.table(), cache=dataset.query_cache
+                )
         elif choice == "6":
-            file_worker = FileWorker(file_json)
-            vacancies = file_worker.load()
-            filtered_vacancies = Vacancy.filter_vacancies_by_keywords(vacancies)
+            if use_sql:
+                filtered_vacancies = Vacancy.filter_vacancies_by_keywords(storage)
+            else:
+                filtered_vacancies = Vacancy.filter_vacancies_by_keywords(
+                    dataset.get_vacancies(),
+                    dataset.keyword_index(),
+                    dataset.query_cache,
+                )
             Vacancy.print_vacancies(filtered_vacancies)
         elif choice == "7":
-            file_worker = FileWorker(file_json)
-            vacancies = file_worker.load()
-            Vacancy.sort_vacancies_by_date(vacancies)
+            if use_sql:
+                Vacancy.sort_vacancies_by_date(storage)
+            else:
+                Vacancy.sort_vacancies_by_date(
+                    dataset.table(), cache=dataset.query_cache
+                )
         elif choice == "8":
             print("Выход из программы.")
             break
+        elif choice == "9":
+            if use_sql:
+                print("Постраничный просмотр доступен только для хранилища json.")
+            else:
+                with RecordStore(records_file, source=file_json) as store:
+                    store.display_page()
         else:
             print("Неверный ввод, попробуйте снова.")
+        if metrics_path:
+            metrics.export(metrics_path)
 
 
 if __name__ == "__main__":
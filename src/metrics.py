@@ -0,0 +1,170 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+METRICS_ENV = "VACANCY_METRICS"
+METRICS_MEMORY_ENV = "VACANCY_METRICS_MEMORY"
+
+
+class Metrics:
+    """
+    Сбор метрик выполнения: время этапов (запрос, разбор, сохранение,
+    загрузка, вывод), счётчики (страницы, вакансии, байты, попадания в кэш)
+    и пиковое потребление памяти. По умолчанию выключен и ничего не замеряет.
+    Пик памяти замеряется через tracemalloc, который заметно замедляет
+    программу, поэтому включается отдельно.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self, trace_memory=False):
+        """
+        Включение сбора метрик.
+
+        :param trace_memory: Замерять ли пик памяти через tracemalloc.
+        """
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        """Выключение сбора метрик."""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self):
+        """Сброс накопленных значений."""
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        """Замер времени выполнения блока кода как этапа name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Декоратор: замер времени выполнения функции как этапа name."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name, seconds):
+        """Добавление одного замера этапа."""
+        with self._lock:
+            stage = self.stages.setdefault(
+                name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            stage["max_seconds"] = max(stage["max_seconds"], seconds)
+
+    def count(self, name, value=1):
+        """Увеличение счётчика name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def peak_memory(self):
+        """Пиковое потребление памяти в байтах или None, если оно не замеряется."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1]
+        return None
+
+    def report(self):
+        """Все метрики в виде словаря."""
+        with self._lock:
+            return {
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "counters": dict(self.counters),
+                "peak_memory_bytes": self.peak_memory(),
+            }
+
+    def to_prometheus(self):
+        """Метрики в текстовом формате Prometheus."""
+        report = self.report()
+        lines = [
+            "# TYPE vacancy_stage_seconds_total counter",
+            "# TYPE vacancy_stage_calls_total counter",
+            "# TYPE vacancy_stage_max_seconds gauge",
+        ]
+        for name, stage in sorted(report["stages"].items()):
+            lines.append(
+                f'vacancy_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}'
+            )
+            lines.append(
+                f'vacancy_stage_calls_total{{stage="{name}"}} {stage["calls"]}'
+            )
+            lines.append(
+                f'vacancy_stage_max_seconds{{stage="{name}"}} {stage["max_seconds"]}'
+            )
+        if report["counters"]:
+            lines.append("# TYPE vacancy_events_total counter")
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f'vacancy_events_total{{name="{name}"}} {value}')
+        if report["peak_memory_bytes"] is not None:
+            lines.append("# TYPE vacancy_peak_memory_bytes gauge")
+            lines.append(f"vacancy_peak_memory_bytes {report['peak_memory_bytes']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        Запись отчёта в файл: в формате Prometheus для файлов .prom,
+        иначе в JSON.
+
+        :param path: Путь к файлу отчёта.
+        """
+        if str(path).endswith(".prom"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.report(), ensure_ascii=False, indent=4)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+
+metrics = Metrics()
+
+
+def enable_from_env():
+    """
+    Включение метрик, если задана переменная окружения VACANCY_METRICS
+    с путём к файлу отчёта. Пик памяти замеряется, только если задана
+    и переменная VACANCY_METRICS_MEMORY=1.
+
+    :return: Путь к файлу отчёта или None.
+    """
+    path = os.environ.get(METRICS_ENV)
+    if path:
+        metrics.enable(
+            trace_memory=os.environ.get(METRICS_MEMORY_ENV, "") not in ("", "0")
+        )
+    return path
@@ -0,0 +1,235 @@
+"""
+Параллельные запросы к хранилищу RecordStore.
+
+Запуск: python -m src.parallel --workers 4 top 10
+Операции: top N, salary MIN MAX, keywords СЛОВО..., date [--limit N].
+"""
+
+import argparse
+import heapq
+import os
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from config import file_json, records_file
+from src.indexes import SalaryIndex
+from src.recordstore import RecordStore
+from src.vacancy import LazyVacancy, Vacancy
+
+# Номер записи занимает младшие 32 бита упакованного ключа сортировки
+POSITION_BITS = 32
+
+_worker_store = None
+
+
+def scan_chunk(store, operation, start, end, args):
+    """
+    Выполнение операции над записями хранилища с номерами [start, end).
+    Записи читаются как LazyVacancy, поэтому разбираются только нужные поля.
+
+    :param store: Объект RecordStore.
+    :param operation: salary, keywords, top_n или date.
+    :param start: Номер первой записи.
+    :param end: Номер записи после последней.
+    :param args: Параметры операции.
+    :return: Список пар (ключ сортировки, номер записи), номеров записей
+        или, для date, массив упакованных ключей по возрастанию.
+    """
+    records = (
+        (position, LazyVacancy(store.get_record(position)))
+        for position in range(start, end)
+    )
+    if operation == "salary":
+        min_salary, max_salary = args
+        result = []
+        for position, vacancy in records:
+            salary = SalaryIndex.salary_of(vacancy)
+            if salary is not None and min_salary <= salary <= max_salary:
+                result.append((salary, position))
+        result.sort()
+        return result
+    if operation == "keywords":
+        (words,) = args
+        return [
+            position
+            for position, vacancy in records
+            if all(
+                word in f"{vacancy.title} {vacancy.description}".lower()
+                for word in words
+            )
+        ]
+    if operation == "top_n":
+        (n,) = args
+        return heapq.nlargest(
+            n, ((vacancy.salary_value, -position) for position, vacancy in records)
+        )
+    if operation == "date":
+        # Ключ -дата * 2**32 + номер: новые раньше, при равной дате - по номеру
+        return array(
+            "q",
+            sorted(
+                (-vacancy.published_ord << POSITION_BITS) + position
+                for position, vacancy in records
+            ),
+        )
+    raise ValueError(f"Неизвестная операция '{operation}'.")
+
+
+def _init_worker(path):
+    global _worker_store
+    _worker_store = RecordStore(path)
+
+
+def _worker_scan(task):
+    version, operation, start, end, args = task
+    if _worker_store.version != version:
+        # Хранилище изменилось после запуска пула: отображения устарели
+        _worker_store.open()
+    return scan_chunk(_worker_store, operation, start, end, args)
+
+
+class StoreResult(Sequence):
+    """
+    Результат запроса: номера записей, вакансии по которым читаются
+    из хранилища только при обращении к ним.
+
+    :param store: Объект RecordStore.
+    :param positions: Номера записей в порядке результата.
+    """
+
+    def __init__(self, store, positions):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StoreResult(self.store, self.positions[index])
+        return self.store.get(self.positions[index])
+
+
+class ParallelQuery:
+    """
+    Параллельное выполнение фильтров, топ-N и сортировки по дате над
+    хранилищем RecordStore в пуле процессов. Записи делятся на части по
+    номерам, каждый процесс сам отображает файлы хранилища в память, поэтому
+    между процессами передаются только параметры и номера найденных записей.
+    Если хранилище изменилось после запуска пула, процессы открывают его
+    заново. Результаты совпадают с соответствующими методами Vacancy и
+    возвращаются как StoreResult.
+
+    :param store: Объект RecordStore.
+    :param workers: Число процессов; по умолчанию - число ядер.
+        При workers=1 операции выполняются в текущем процессе.
+    :param chunks_per_worker: На сколько частей делится работа каждого процесса.
+    """
+
+    def __init__(self, store, workers=None, chunks_per_worker=4):
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Остановка пула процессов."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _map(self, operation, *args):
+        """Результаты операции по частям хранилища в порядке номеров записей."""
+        count = len(self.store)
+        if self.workers <= 1 or count == 0:
+            return [scan_chunk(self.store, operation, 0, count, args)]
+
+        chunk_size = -(-count // (self.workers * self.chunks_per_worker))
+        tasks = [
+            (self.store.version, operation, start, min(start + chunk_size, count), args)
+            for start in range(0, count, chunk_size)
+        ]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.store.path,),
+            )
+        return list(self._executor.map(_worker_scan, tasks))
+
+    def _result(self, positions):
+        return StoreResult(self.store, array("Q", positions))
+
+    def filter_by_salary(self, min_salary, max_salary):
+        """Вакансии с зарплатой в диапазоне по возрастанию зарплаты."""
+        pairs = heapq.merge(*self._map("salary", min_salary, max_salary))
+        return self._result(position for _, position in pairs)
+
+    def filter_by_keywords(self, words):
+        """Вакансии, в названии и описании которых есть все слова."""
+        words = [word.lower() for word in words if word]
+        return self._result(
+            position for chunk in self._map("keywords", words) for position in chunk
+        )
+
+    def top_n(self, n):
+        """n вакансий с наибольшей зарплатой."""
+        pairs = heapq.nlargest(
+            n, (pair for chunk in self._map("top_n", n) for pair in chunk)
+        )
+        return self._result(-position for _, position in pairs)
+
+    def sort_by_date(self):
+        """Вакансии от новых к старым, с одинаковой датой - в порядке записей."""
+        keys = array("q")
+        for chunk in self._map("date"):
+            keys.extend(chunk)
+        mask = (1 << POSITION_BITS) - 1
+        return self._result(key & mask for key in sorted(keys))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Запросы к хранилищу вакансий в нескольких процессах"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="число процессов; по умолчанию - число ядер"
+    )
+    parser.add_argument("--source", default=file_json, help="файл вакансий")
+    parser.add_argument("--store", default=records_file, help="файл RecordStore")
+    operations = parser.add_subparsers(dest="operation", required=True)
+    top = operations.add_parser("top", help="вакансии с наибольшей зарплатой")
+    top.add_argument("n", type=int)
+    salary = operations.add_parser("salary", help="вакансии в диапазоне зарплат")
+    salary.add_argument("min_salary", type=int)
+    salary.add_argument("max_salary", type=int)
+    keywords = operations.add_parser("keywords", help="вакансии со всеми словами")
+    keywords.add_argument("words", nargs="+")
+    date = operations.add_parser("date", help="вакансии от новых к старым")
+    date.add_argument("--limit", type=int, help="сколько вакансий вывести")
+    args = parser.parse_args()
+
+    with RecordStore(args.store, source=args.source) as store:
+        with ParallelQuery(store, workers=args.workers) as query:
+            if args.operation == "top":
+                result = query.top_n(args.n)
+            elif args.operation == "salary":
+                result = query.filter_by_salary(args.min_salary, args.max_salary)
+            elif args.operation == "keywords":
+                result = query.filter_by_keywords(args.words)
+            else:
+                result = query.sort_by_date()[: args.limit]
+            if not result:
+                print("Нет вакансий, соответствующих заданным критериям.")
+            Vacancy.print_vacancies(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.metrics import metrics
+
+_DONE = object()
+
+
+class HarvestPipeline:
+    """
+    Потоковый сбор вакансий: запрос страниц, разбор и сохранение работают
+    одновременно и связаны очередями ограниченного размера, поэтому в памяти
+    находится не больше нескольких страниц и одной партии вакансий.
+    Вакансии сохраняются партиями; после каждой партии в файл контрольной
+    точки записывается следующая страница, с которой продолжится прерванный
+    сбор с теми же параметрами. После успешного завершения файл удаляется.
+
+    :param hhapi: Объект HHAPI, через который запрашиваются страницы.
+    :param storage: Хранилище с методом save.
+    :param checkpoint_file: Файл контрольной точки или None.
+    :param batch_size: Число вакансий в одной сохраняемой партии.
+    :param queue_size: Размер очередей между этапами.
+    """
+
+    def __init__(
+        self, hhapi, storage, checkpoint_file=None, batch_size=200, queue_size=4
+    ):
+        self.hhapi = hhapi
+        self.storage = storage
+        self.checkpoint_file = checkpoint_file
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def load_checkpoint(self, params):
+        """
+        Страница, с которой нужно продолжить сбор.
+
+        :param params: Параметры запроса.
+        :return: Номер страницы из контрольной точки для тех же параметров,
+            иначе начальная страница из params.
+        """
+        if self.checkpoint_file is None:
+            return params["page"]
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as file:
+                checkpoint = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return params["page"]
+        if checkpoint.get("params") != self._query(params):
+            return params["page"]
+        return checkpoint.get("next_page", params["page"])
+
+    def save_checkpoint(self, params, next_page):
+        """Запись контрольной точки: следующая страница для тех же параметров."""
+        if self.checkpoint_file is None:
+            return
+        tmp_file = f"{self.checkpoint_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as file:
+            json.dump(
+                {"params": self._query(params), "next_page": next_page},
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def clear_checkpoint(self):
+        """Удаление контрольной точки после завершённого сбора."""
+        if self.checkpoint_file is not None and os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+    @staticmethod
+    def _query(params):
+        """Параметры запроса без номера страницы в виде, пригодном для JSON."""
+        return json.loads(
+            json.dumps({key: value for key, value in params.items() if key != "page"})
+        )
+
+    @staticmethod
+    def _put(output, message, stop):
+        """Передача сообщения следующему этапу, пока сбор не остановлен."""
+        while not stop.is_set():
+            try:
+                output.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source, stop):
+        """Получение сообщения от предыдущего этапа или _DONE после остановки."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fetch(self, params, start_page, output, stop):
+        """Этап запроса: страницы по порядку, не больше max_workers одновременно."""
+        try:
+            first_response = self.hhapi.fetch_page(start_page, params)
+            if not self._put(output, (start_page, first_response), stop):
+                return
+            if first_response.status_code != 200:
+                return
+            last_page = min(self.hhapi.count_pages(first_response), self.hhapi.pages)
+            with ThreadPoolExecutor(max_workers=self.hhapi.max_workers) as executor:
+                pending = deque()
+                for page in range(start_page + 1, last_page):
+                    pending.append(
+                        (page, executor.submit(self.hhapi.fetch_page, page, params))
+                    )
+                    if len(pending) >= self.hhapi.max_workers:
+                        page, future = pending.popleft()
+                        if not self._put(output, (page, future.result()), stop):
+                            return
+                while pending:
+                    page, future = pending.popleft()
+                    if not self._put(output, (page, future.result()), stop):
+                        return
+        except Exception as e:
+            self._put(output, (None, e), stop)
+        finally:
+            self._put(output, _DONE, stop)
+
+    def _parse(self, keyword, source, output, stop):
+        """Этап разбора: вакансии каждой страницы, подходящие под запрос."""
+        try:
+            while True:
+                message = self._get(source, stop)
+                if message is _DONE:
+                    break
+                page, response = message
+                try:
+                    payload = self._parse_page(response, keyword)
+                except Exception as e:
+                    payload = e
+                if not self._put(output, (page, payload), stop) or isinstance(
+                    payload, Exception
+                ):
+                    break
+        finally:
+            self._put(output, _DONE, stop)
+
+    def _parse_page(self, response, keyword):
+        """Вакансии одной страницы или исключение, которое нужно передать дальше."""
+        if isinstance(response, Exception):
+            return response
+        if response.status_code != 200:
+            return RuntimeError(f"Ошибка запроса: {response.status_code}")
+        with metrics.stage("parse"):
+            items = response.json().get("items", [])
+            metrics.count("items", len(items))
+            vacancies = []
+            for item in items:
+                vacancy = self.hhapi.parse_item(item, keyword)
+                if vacancy is not None:
+                    vacancies.append(vacancy)
+        return vacancies
+
+    @staticmethod
+    def _receive(source, stages):
+        """
+        Сообщение от последнего этапа. Если этапы завершились, не передав
+        _DONE, возвращается ошибка, чтобы сбор не ждал бесконечно.
+        """
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if any(stage.is_alive() for stage in stages):
+                    continue
+            try:
+                return source.get_nowait()
+            except queue.Empty:
+                return None, RuntimeError("этапы сбора остановились")
+
+    def run(self, params, keyword):
+        """
+        Сбор вакансий по параметрам запроса с продолжением
+        с контрольной точки.
+
+        :param params: Параметры запроса, см. HHAPI.build_params.
+        :param keyword: Ключевое слово в нижнем регистре для parse_item.
+        :return: Количество найденных вакансий.
+        """
+        start_page = self.load_checkpoint(params)
+        if start_page != params["page"]:
+            print(f"Сбор продолжается со страницы {start_page + 1}.")
+        fetched = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        stages = [
+            threading.Thread(
+                target=self._fetch, args=(params, start_page, fetched, stop)
+            ),
+            threading.Thread(target=self._parse, args=(keyword, fetched, parsed, stop)),
+        ]
+        for stage in stages:
+            stage.start()
+
+        batch, next_page, found = [], start_page, 0
+        error = None
+        try:
+            while True:
+                message = self._receive(parsed, stages)
+                if message is _DONE:
+                    break
+                page, payload = message
+                if isinstance(payload, Exception):
+                    error = payload
+                    break
+                batch.extend(payload)
+                next_page = page + 1
+                if len(batch) >= self.batch_size:
+                    self.storage.save(batch)
+                    found += len(batch)
+                    batch = []
+                    self.save_checkpoint(params, next_page)
+            if batch:
+                self.storage.save(batch)
+                found += len(batch)
+            self.save_checkpoint(params, next_page)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+
+        if error is not None:
+            print(
+                f"Сбор прерван: {error}. "
+                f"Повторный запуск продолжит со страницы {next_page + 1}."
+            )
+        else:
+            self.clear_checkpoint()
+        return found
@@ -0,0 +1,134 @@
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+_caches = weakref.WeakSet()
+
+
+class QueryCache:
+    """
+    Кэш результатов запросов к вакансиям (фильтры, топ-N, сортировка)
+    с вытеснением давно не использованных записей. Размер ограничен числом
+    записей и оценкой занимаемой памяти: результаты - списки ссылок на уже
+    загруженные вакансии, поэтому учитывается размер самих списков.
+    Ключ записи включает версию набора данных; при смене версии кэш
+    очищается. Кэш, привязанный к файлу хранилища, очищается также при
+    сохранении, сжатии или удалении вакансий этого файла через FileWorker;
+    кэши других файлов при этом не затрагиваются.
+
+    :param max_entries: Наибольшее число записей.
+    :param max_bytes: Наибольший суммарный размер результатов в байтах.
+    :param path: Файл хранилища, по которому строятся результаты, или None.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=32 * 2**20, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.version = None
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path = storage_key(value) if value is not None else None
+
+    @staticmethod
+    def size_of(result):
+        """Оценка памяти, занимаемой результатом, в байтах."""
+        return sys.getsizeof(result)
+
+    def set_version(self, version):
+        """Смена версии набора данных: записи прежней версии удаляются."""
+        if isinstance(version, list):
+            version = tuple(version)
+        with self._lock:
+            if version != self.version:
+                self._clear()
+                self.version = version
+
+    def invalidate(self):
+        """Удаление всех записей."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+        self._generation += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Результат запроса из кэша или вычисленный заново.
+
+        :param key: Хэшируемые параметры запроса.
+        :param compute: Функция без аргументов, вычисляющая результат.
+        :return: Результат запроса; его нельзя изменять, он общий для повторов.
+        """
+        key = (self.version, key)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        result = compute()
+        size = self.size_of(result)
+        with self._lock:
+            if size > self.max_bytes or generation != self._generation:
+                return result
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self.entries[key] = (result, size)
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or (
+                self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+        return result
+
+    def stats(self):
+        """Счётчики кэша."""
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def storage_key(path):
+    """Путь к файлу хранилища в виде, по которому сравниваются кэши."""
+    return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+
+def invalidate_path(path):
+    """
+    Очистка кэшей запросов, привязанных к изменённому файлу хранилища.
+
+    :param path: Путь к файлу хранилища.
+    """
+    key = storage_key(path)
+    for cache in list(_caches):
+        if cache.path == key:
+            cache.invalidate()
@@ -0,0 +1,421 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+
+from src.fileworker import AbstractFileWorker, FileWorker
+from src.indexes import file_version
+from src.serializers import detect_serializer
+from src.vacancy import Vacancy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class RecordStore(AbstractFileWorker):
+    """
+    Хранилище вакансий с произвольным доступом к записям.
+    Данные лежат в файле JSON Lines, рядом в файле <path>.offsets хранится
+    индекс: границы каждой записи в байтах и отсортированные ключи
+    вакансий (Vacancy.dedup_key) с номерами записей. Оба файла
+    отображаются в память, поэтому запись по номеру, страница или вакансия
+    по ссылке читаются без загрузки всего файла.
+
+    Если указан source, хранилище служит постраничным представлением
+    другого файла вакансий. Когда в source дописаны новые вакансии, из него
+    читается только дописанный хвост; полностью хранилище пересобирается,
+    только если source был перезаписан (очистка, сжатие, другой формат).
+
+    :param path: Путь к файлу данных.
+    :param source: Файл вакансий любого формата FileWorker или None.
+    """
+
+    HEADER = struct.Struct("=7Q")
+    TAIL_CHECK = 4096
+
+    def __init__(self, path, source=None):
+        self.path = path
+        self.index_path = f"{path}.offsets"
+        self.source = source
+        self.count = 0
+        self.source_version = None
+        self.source_state = None
+        self.version = None
+        self._files = []
+        self._mmaps = []
+        self._data = b""
+        self._offsets = []
+        self._keys = []
+        self._positions = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        self._ensure_open()
+        return self.count
+
+    def open(self):
+        """
+        Открытие хранилища. Устаревший индекс строится заново,
+        а при изменении файла source заново переносятся данные.
+        """
+        self.close()
+        header = self._open_index()
+        if self.source is not None:
+            source_version = file_version(self.source) or [0, 0]
+            if header is None or list(header[3:5]) != source_version[::-1]:
+                if header is None or not self._import_tail(header):
+                    self.close()
+                    self.import_from(FileWorker(self.source), source_version)
+                header = self._open_index()
+        if header is None:
+            self.close()
+            self.rebuild_index()
+            header = self._open_index()
+
+        self.source_version = [header[4], header[3]] if header[3] else None
+        self.source_state = list(header[3:])
+        self.version = [header[2], header[1]]
+        if header[1]:
+            file = open(self.path, "rb")
+            self._files.append(file)
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmaps.append(self._data)
+
+    def close(self):
+        """Освобождение отображений файлов в память."""
+        for view in (self._offsets, self._keys, self._positions):
+            if isinstance(view, memoryview):
+                view.release()
+        self._offsets, self._keys, self._positions = [], [], []
+        self._data = b""
+        self.count = 0
+        for item in self._mmaps + self._files:
+            item.close()
+        self._mmaps, self._files = [], []
+
+    def _ensure_open(self):
+        if not self._files:
+            self.open()
+
+    def _open_index(self):
+        """
+        Отображение файла индекса в память.
+
+        :return: Заголовок индекса или None, если индекс отсутствует
+            или построен для другой версии файла данных.
+        """
+        try:
+            file = open(self.index_path, "rb")
+        except OSError:
+            return None
+        self._files.append(file)
+        size = os.fstat(file.fileno()).st_size
+        if size < self.HEADER.size:
+            return None
+        header = self.HEADER.unpack(file.read(self.HEADER.size))
+        count, data_size, data_mtime = header[:3]
+        data_version = file_version(self.path) or [0, 0]
+        if size != self.HEADER.size + count * 32 or data_version != [
+            data_mtime,
+            data_size,
+        ]:
+            return None
+
+        index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmaps.append(index)
+        view = memoryview(index)
+        start = self.HEADER.size
+        self._offsets = view[start : start + count * 16].cast("Q")
+        start += count * 16
+        self._keys = view[start : start + count * 8].cast("Q")
+        start += count * 8
+        self._positions = view[start:].cast("Q")
+        view.release()
+        self.count = count
+        return header
+
+    def _write_index(self, offsets, pairs, source_state=None):
+        """
+        Запись индекса для текущей версии файла данных.
+
+        :param offsets: Начала и концы записей подряд.
+        :param pairs: Пары (ключ, номер записи), отсортированные по ключу.
+        :param source_state: Состояние файла source из _source_state или None.
+        """
+        keys, positions = array("Q"), array("Q")
+        for key, position in pairs:
+            keys.append(key)
+            positions.append(position)
+        version = file_version(self.path) or [0, 0]
+        source_state = source_state or [0, 0, 0, 0]
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(
+                self.HEADER.pack(len(keys), version[1], version[0], *source_state)
+            )
+            array("Q", offsets).tofile(file)
+            keys.tofile(file)
+            positions.tofile(file)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def encode(record):
+        """Запись в виде строки JSON Lines в байтах."""
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def decode(data):
+        """Разбор одной записи."""
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+    def rebuild_index(self):
+        """
+        Построение индекса по файлу данных. Повреждённые строки
+        пропускаются с сообщением об ошибке.
+        """
+        offsets, pairs = array("Q"), []
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                start = 0
+                for number, line in enumerate(file, start=1):
+                    end = start + len(line)
+                    if line.strip():
+                        try:
+                            key = Vacancy.key_for_url(
+                                self.decode(line)["alternate_url"]
+                            )
+                        except (KeyError, TypeError, ValueError) as e:
+                            print(f"Ошибка разбора записи в строке {number}: {e}")
+                        else:
+                            pairs.append((key, len(pairs)))
+                            offsets.extend((start, end))
+                    start = end
+        pairs.sort()
+        self._write_index(offsets, pairs)
+
+    def _source_state(self, source_version=None):
+        """
+        Состояние файла source для заголовка индекса: размер, время
+        изменения, позиция, после которой дописываются новые записи,
+        и контрольная сумма байтов перед этой позицией. Снимается до чтения
+        source, поэтому дописанное во время чтения будет прочитано снова,
+        а повторы отсеются по ключу.
+
+        :param source_version: Версия файла source, если уже известна.
+        :return: Список из четырёх чисел; нули, если source не задан или пуст.
+        """
+        serializer = detect_serializer(self.source) if self.source else None
+        if serializer is None:
+            return [0, 0, 0, 0]
+        source_version = source_version or file_version(self.source)
+        offset = serializer.tail_offset(self.source)
+        return [source_version[1], source_version[0], offset, self._tail_crc(offset)]
+
+    def _tail_crc(self, offset):
+        """Контрольная сумма байтов source перед позицией offset."""
+        start = max(offset - self.TAIL_CHECK, 0)
+        with open(self.source, "rb") as file:
+            file.seek(start)
+            return zlib.crc32(file.read(offset - start))
+
+    def _import_tail(self, header):
+        """
+        Перенос вакансий, дописанных в source после прошлого переноса.
+
+        :param header: Заголовок открытого индекса.
+        :return: False, если source был перезаписан и нужен полный перенос.
+        """
+        offset, crc = header[5:]
+        serializer = detect_serializer(self.source)
+        if serializer is None or not offset:
+            return False
+        try:
+            if offset > os.path.getsize(self.source) or self._tail_crc(offset) != crc:
+                return False
+            source_state = self._source_state()
+            vacancies = [
+                Vacancy.from_trusted(item)
+                for item in serializer.iter_tail(self.source, offset)
+            ]
+        except (OSError, KeyError, TypeError, ValueError):
+            return False
+        self._append(self._new_vacancies(vacancies), source_state)
+        return True
+
+    def import_from(self, worker, source_version=None):
+        """
+        Перенос вакансий из другого хранилища без повторов.
+
+        :param worker: Хранилище с методом iter_load.
+        :param source_version: Версия файла source, если переносится он.
+        :return: Количество перенесённых вакансий.
+        """
+        self.close()
+        source_state = (
+            self._source_state(source_version) if source_version is not None else None
+        )
+        offsets, pairs, seen = array("Q"), [], set()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            for vacancy in worker.iter_load():
+                key = vacancy.dedup_key
+                if key in seen:
+                    continue
+                seen.add(key)
+                start = file.tell()
+                file.write(self.encode(vacancy.to_dict()))
+                offsets.extend((start, file.tell()))
+                pairs.append((key, len(pairs)))
+        os.replace(tmp_path, self.path)
+        pairs.sort()
+        self._write_index(offsets, pairs, source_state)
+        return len(pairs)
+
+    def position_of(self, key):
+        """
+        Номер записи вакансии с ключом dedup_key.
+
+        :return: Номер записи или None.
+        """
+        self._ensure_open()
+        index = bisect_left(self._keys, key)
+        if index < self.count and self._keys[index] == key:
+            return self._positions[index]
+        return None
+
+    def get_record(self, position):
+        """
+        Исходный словарь записи по её номеру.
+
+        :param position: Номер записи, начиная с 0.
+        :return: Словарь в формате Vacancy.to_dict.
+        """
+        self._ensure_open()
+        if not 0 <= position < self.count:
+            raise IndexError("Номер записи вне диапазона.")
+        start, end = self._offsets[2 * position], self._offsets[2 * position + 1]
+        return self.decode(self._data[start:end])
+
+    def get(self, position):
+        """
+        Вакансия по номеру записи.
+
+        :param position: Номер записи, начиная с 0.
+        :return: Объект Vacancy.
+        """
+        return Vacancy.from_trusted(self.get_record(position))
+
+    def find(self, key):
+        """Вакансия по ключу dedup_key или None."""
+        position = self.position_of(key)
+        return self.get(position) if position is not None else None
+
+    def find_by_url(self, url):
+        """Вакансия по ссылке или None."""
+        return self.find(Vacancy.key_for_url(url))
+
+    def page_count(self, page_size=20):
+        """Количество страниц при размере страницы page_size."""
+        return -(-len(self) // page_size)
+
+    def page(self, number, page_size=20):
+        """
+        Страница вакансий.
+
+        :param number: Номер страницы, начиная с 1.
+        :param page_size: Количество вакансий на странице.
+        :return: Список объектов Vacancy; пустой, если страницы нет.
+        """
+        self._ensure_open()
+        start = max(number - 1, 0) * page_size
+        end = min(start + page_size, self.count)
+        return [self.get(position) for position in range(start, end)]
+
+    def display_page(self, page_size=20):
+        """Запрашивает номер страницы и выводит вакансии этой страницы."""
+        pages = self.page_count(page_size)
+        if not pages:
+            print("Файл пуст. Пожалуйста, сделайте API запрос для получения вакансий.")
+            return
+        while True:
+            try:
+                number = int(input(f"Введите номер страницы (1-{pages}): "))
+                if 1 <= number <= pages:
+                    print(f"Страница {number} из {pages}:")
+                    Vacancy.print_vacancies(self.page(number, page_size))
+                    break
+                else:
+                    print("Страницы с таким номером нет.")
+            except ValueError:
+                print("Пожалуйста, введите корректное число.")
+
+    def save(self, vacancies):
+        """
+        Дописывает в файл вакансии, которых ещё нет в хранилище,
+        и дополняет индекс без повторного чтения файла данных.
+
+        :param vacancies: Список вакансий для сохранения.
+        """
+        self._ensure_open()
+        new_vacancies = self._new_vacancies(vacancies)
+        if new_vacancies:
+            self._append(new_vacancies, self.source_state)
+
+    def _new_vacancies(self, vacancies):
+        """Вакансии, которых ещё нет в хранилище, по ключу dedup_key."""
+        new_vacancies = {}
+        for vacancy in vacancies:
+            key = vacancy.dedup_key
+            if key not in new_vacancies and self.position_of(key) is None:
+                new_vacancies[key] = vacancy
+        return new_vacancies
+
+    def _append(self, new_vacancies, source_state):
+        """
+        Дописывание новых вакансий и запись индекса. Индекс записывается
+        и без новых вакансий, чтобы обновить состояние source.
+
+        :param new_vacancies: Словарь {dedup_key: вакансия} из _new_vacancies.
+        :param source_state: Состояние source для заголовка индекса.
+        """
+        offsets = array("Q", self._offsets)
+        old_pairs = list(zip(self._keys, self._positions))
+        new_pairs = []
+        self.close()
+        with open(self.path, "ab") as file:
+            for key, vacancy in new_vacancies.items():
+                start = file.tell()
+                file.write(self.encode(vacancy.to_dict()))
+                offsets.extend((start, file.tell()))
+                new_pairs.append((key, len(old_pairs) + len(new_pairs)))
+        new_pairs.sort()
+        self._write_index(offsets, heapq.merge(old_pairs, new_pairs), source_state)
+
+    def load(self):
+        """
+        Загрузка всех вакансий.
+
+        :return: Список объектов Vacancy.
+        """
+        return list(self.iter_load())
+
+    def iter_load(self):
+        """
+        Вакансии по порядку записей.
+
+        :return: Генератор объектов Vacancy.
+        """
+        for position in range(len(self)):
+            yield self.get(position)
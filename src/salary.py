@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import threading
+
+from config import currencies_json
+
+# Рублей за единицу валюты; используются, пока нет сохранённого справочника hh.ru
+DEFAULT_RATES = {
+    "RUR": 1.0,
+    "RUB": 1.0,
+    "USD": 90.0,
+    "EUR": 98.0,
+    "KZT": 0.18,
+    "BYR": 28.0,
+    "UAH": 2.2,
+    "UZS": 0.0072,
+    "AZN": 53.0,
+    "GEL": 33.0,
+    "KGS": 1.03,
+}
+
+
+class CurrencyRates:
+    """
+    Таблица курсов валют к рублю. Загружается один раз за время работы
+    программы из файла кэша справочника hh.ru, а если его нет - берутся
+    курсы DEFAULT_RATES.
+
+    :param cache_file: Файл с сохранённой таблицей курсов.
+    """
+
+    def __init__(self, cache_file=currencies_json):
+        self.cache_file = cache_file
+        self._table = None
+        self._lock = threading.Lock()
+
+    def table(self):
+        """
+        Таблица курсов: код валюты -> рублей за единицу.
+
+        :return: Словарь курсов.
+        """
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = self._load()
+        return self._table
+
+    def _load(self):
+        table = dict(DEFAULT_RATES)
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file:
+                table.update(json.load(file))
+        except (OSError, json.JSONDecodeError, TypeError, ValueError):
+            pass
+        return table
+
+    def update(self, currencies):
+        """
+        Обновление таблицы по справочнику валют hh.ru и сохранение её в кэш.
+
+        :param currencies: Список словарей с полями code и rate
+            (единиц валюты за рубль), как в ответе /dictionaries.
+        :return: Обновлённая таблица курсов.
+        """
+        table = dict(DEFAULT_RATES)
+        for currency in currencies:
+            if currency.get("rate"):
+                table[currency["code"]] = 1 / currency["rate"]
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as file:
+                json.dump(table, file)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Не удалось сохранить курсы валют: {e}")
+        self._table = table
+        return table
+
+    def to_rub(self, amount, currency):
+        """
+        Перевод суммы в рубли.
+
+        :param amount: Целая сумма.
+        :param currency: Код валюты; None означает рубли.
+        :return: Сумма в рублях или None, если курс валюты неизвестен.
+        """
+        if currency is None or currency in ("RUR", "RUB"):
+            return amount
+        rate = self.table().get(currency)
+        return round(amount * rate) if rate else None
+
+
+rates = CurrencyRates()
+
+
+def parse_amount(value):
+    """
+    Сумма зарплаты в виде целого числа.
+
+    :param value: Число или строка вида "100 000"; "Зарплата не указана" и
+        прочие строки без цифр означают, что зарплата неизвестна.
+    :return: Целое число или None.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        digits = re.sub(r"[^\d]", "", value)
+        return int(digits) if digits else None
+    return None
+
+
+def normalize(salary_from, salary_to, currency):
+    """
+    Зарплата в рублях для сравнения и поиска: нижняя граница вилки,
+    а если она не указана - верхняя.
+
+    :return: Целое число или None, если зарплата или курс валюты неизвестны.
+    """
+    amount = salary_from if salary_from is not None else salary_to
+    if amount is None:
+        return None
+    return rates.to_rub(amount, currency)
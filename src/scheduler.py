@@ -0,0 +1,160 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+
+class RequestScheduler:
+    """
+    Планировщик запросов к API: повторяет запросы при ответах 429/5xx
+    и сетевых ошибках, учитывает заголовок Retry-After (но ждёт не дольше
+    max_delay), делает паузы с экспоненциальным ростом и случайным
+    разбросом, а также подстраивает число одновременных запросов и их
+    частоту под ответы сервера.
+
+    :param max_retries: Максимальное число повторов одного запроса.
+    :param base_delay: Начальная пауза перед повтором, в секундах.
+    :param max_delay: Максимальная пауза перед повтором, в секундах.
+    :param max_concurrency: Максимальное число одновременных запросов.
+    :param max_rate: Частота запросов в секунду, выше которой ограничение снимается.
+    :param min_rate: Минимальная частота запросов в секунду.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    THROTTLE_STATUSES = {429, 503}
+
+    def __init__(
+        self,
+        max_retries=5,
+        base_delay=0.5,
+        max_delay=30.0,
+        max_concurrency=8,
+        max_rate=50.0,
+        min_rate=0.5,
+        sleep=time.sleep,
+        clock=time.monotonic,
+        jitter=random.random,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.sleep = sleep
+        self.clock = clock
+        self.jitter = jitter
+
+        self.concurrency = max_concurrency
+        self.rate = None
+        self.retries = 0
+        self.throttled = 0
+        self._active = 0
+        self._successes = 0
+        self._next_time = 0.0
+        self._condition = threading.Condition()
+
+    def _acquire(self):
+        with self._condition:
+            while self._active >= self.concurrency:
+                self._condition.wait()
+            self._active += 1
+            delay = 0.0
+            if self.rate is not None:
+                now = self.clock()
+                start = max(now, self._next_time)
+                self._next_time = start + 1 / self.rate
+                delay = start - now
+        if delay > 0:
+            self.sleep(delay)
+
+    def _release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def _on_success(self):
+        """Плавное увеличение частоты и числа одновременных запросов."""
+        with self._condition:
+            self._successes += 1
+            if self.rate is not None:
+                self.rate += 0.5
+                if self.rate >= self.max_rate:
+                    self.rate = None
+            if self._successes % 10 == 0 and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._condition.notify_all()
+
+    def _on_throttle(self):
+        """Резкое снижение частоты и числа одновременных запросов."""
+        with self._condition:
+            self.throttled += 1
+            self._successes = 0
+            current = self.rate if self.rate is not None else float(self.concurrency)
+            self.rate = max(self.min_rate, current / 2)
+            self.concurrency = max(1, self.concurrency // 2)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Пауза из заголовка Retry-After.
+
+        :param value: Число секунд или дата в формате HTTP.
+        :return: Пауза в секундах или None.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            # дата с поясом -0000 разбирается без пояса, по RFC 7231 это UTC
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff(self, attempt):
+        """Пауза перед повтором номер attempt с полным случайным разбросом."""
+        return min(self.max_delay, self.base_delay * 2**attempt) * self.jitter()
+
+    def request(self, send):
+        """
+        Выполнение запроса с повторами.
+
+        :param send: Функция без аргументов, выполняющая запрос и возвращающая ответ.
+        :return: Ответ сервера; после исчерпания повторов - последний ответ.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire()
+            try:
+                response = send()
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response = None
+                error = e
+            finally:
+                self._release()
+
+            if response is not None and response.status_code not in self.RETRY_STATUSES:
+                self._on_success()
+                return response
+
+            delay = None
+            if response is not None and response.status_code in self.THROTTLE_STATUSES:
+                self._on_throttle()
+                delay = self.parse_retry_after(response.headers.get("Retry-After"))
+                if delay is not None:
+                    delay = min(delay, self.max_delay)
+            if attempt == self.max_retries:
+                if response is None:
+                    raise error
+                return response
+            self.retries += 1
+            self.sleep(delay if delay is not None else self.backoff(attempt))
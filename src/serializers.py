@@ -0,0 +1,328 @@
+import io
+import json
+import os
+import textwrap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MAGIC = b"VACMSGP1"
+
+
+def iter_json_array(file, chunk_size=65536, state="["):
+    """
+    Инкрементальный разбор JSON-массива верхнего уровня.
+
+    :param file: Открытый текстовый файл.
+    :param chunk_size: Размер читаемой за раз части файла в символах.
+    :param state: Место в массиве, с которого начинается file: "[" - начало
+        массива, "first" - сразу после "[", "," - после очередного элемента.
+    :return: Генератор элементов массива.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Неожиданный конец файла", buffer, pos)
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = chunk, 0, not chunk
+            continue
+
+        char = buffer[pos]
+        if state == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Ожидался '['", buffer, pos)
+            pos += 1
+            state = "first"
+        elif char == "]" and state in ("first", ","):
+            return
+        elif state == ",":
+            if char != ",":
+                raise json.JSONDecodeError("Ожидался ',' или ']'", buffer, pos)
+            pos += 1
+            state = "value"
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                chunk = file.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield item
+            pos = end
+            state = ","
+
+
+class JsonSerializer:
+    """Массив JSON с отступами - исходный формат файла вакансий."""
+
+    name = "json"
+    indent = 4
+    separators = None
+
+    def dump(self, records, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                list(records),
+                file,
+                ensure_ascii=False,
+                indent=self.indent,
+                separators=self.separators,
+            )
+
+    def encode_item(self, record):
+        """Запись в том виде, в котором она стоит внутри массива."""
+        text = json.dumps(
+            record, ensure_ascii=False, indent=self.indent, separators=self.separators
+        )
+        return textwrap.indent(text, " " * self.indent) if self.indent else text
+
+    def append(self, records, path):
+        """
+        Дописывание записей в конец массива без перезаписи файла:
+        закрывающая скобка отрезается и массив дописывается заново.
+        """
+        items = [self.encode_item(record) for record in records]
+        if not items:
+            return
+        newline = "\n" if self.indent else ""
+        separator = f",{newline}"
+        with open(path, "r+b") as file:
+            end = self._last_item_end(file)
+            file.seek(end)
+            file.truncate()
+            file.seek(end - 1)
+            empty = file.read(1) == b"["
+            text = (newline if empty else separator) + separator.join(items)
+            file.write((text + newline + "]").encode("utf-8"))
+
+    @staticmethod
+    def _reversed_bytes(file, block_size=4096):
+        """Байты файла с конца к началу вместе с их позициями."""
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        while position > 0:
+            start = max(0, position - block_size)
+            file.seek(start)
+            block = file.read(position - start)
+            for offset in range(len(block) - 1, -1, -1):
+                yield start + offset, block[offset : offset + 1]
+            position = start
+
+    def _last_item_end(self, file):
+        """Позиция сразу после последнего элемента массива (перед ']')."""
+        seen_bracket = False
+        for position, char in self._reversed_bytes(file):
+            if char.isspace():
+                continue
+            if seen_bracket:
+                return position + 1
+            if char != b"]":
+                break
+            seen_bracket = True
+        raise ValueError("Файл не является JSON-массивом.")
+
+    def load(self, path):
+        if orjson is not None:
+            with open(path, "rb") as file:
+                return orjson.loads(file.read())
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def iter_load(self, path, chunk_size=65536):
+        with open(path, "r", encoding="utf-8") as file:
+            yield from iter_json_array(file, chunk_size)
+
+    def tail_offset(self, path):
+        """Позиция в байтах, после которой append дописывает новые записи."""
+        with open(path, "rb") as file:
+            return self._last_item_end(file)
+
+    def iter_tail(self, path, offset, chunk_size=65536):
+        """Записи, дописанные в массив после позиции offset из tail_offset."""
+        with open(path, "rb") as file:
+            file.seek(offset - 1)
+            state = "first" if file.read(1) == b"[" else ","
+            text = io.TextIOWrapper(file, encoding="utf-8")
+            yield from iter_json_array(text, chunk_size, state)
+
+
+class CompactJsonSerializer(JsonSerializer):
+    """Массив JSON без отступов и пробелов."""
+
+    name = "json-compact"
+    indent = None
+    separators = (",", ":")
+
+
+class OrjsonSerializer(CompactJsonSerializer):
+    """Компактный массив JSON, записываемый библиотекой orjson."""
+
+    name = "orjson"
+
+    def dump(self, records, path):
+        if orjson is None:
+            raise RuntimeError("Для формата orjson установите пакет orjson.")
+        with open(path, "wb") as file:
+            file.write(orjson.dumps(list(records)))
+
+    def encode_item(self, record):
+        if orjson is None:
+            return super().encode_item(record)
+        return orjson.dumps(record).decode("utf-8")
+
+
+class JsonLinesSerializer:
+    """JSON Lines: по одной вакансии в строке."""
+
+    name = "jsonl"
+
+    def dump(self, records, path):
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def append(self, records, path):
+        with open(path, "a", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load(self, path):
+        return list(self.iter_load(path))
+
+    def iter_load(self, path, chunk_size=None):
+        """Записи по строкам; повреждённые строки пропускаются с сообщением."""
+        with open(path, "r", encoding="utf-8") as file:
+            yield from self._iter_lines(file)
+
+    @staticmethod
+    def _iter_lines(file):
+        loads = orjson.loads if orjson is not None else json.loads
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                print(f"Ошибка декодирования JSON в строке {number}: {e}")
+
+    def tail_offset(self, path):
+        """Позиция в байтах, после которой append дописывает новые записи."""
+        return os.path.getsize(path)
+
+    def iter_tail(self, path, offset, chunk_size=None):
+        """Записи, дописанные после позиции offset из tail_offset."""
+        with open(path, "rb") as file:
+            file.seek(offset)
+            yield from self._iter_lines(io.TextIOWrapper(file, encoding="utf-8"))
+
+
+class MsgpackSerializer:
+    """Двоичный формат MessagePack: заголовок и поток записей."""
+
+    name = "msgpack"
+
+    @staticmethod
+    def _require():
+        if msgpack is None:
+            raise RuntimeError("Для формата msgpack установите пакет msgpack.")
+
+    def dump(self, records, path):
+        self._require()
+        packer = msgpack.Packer()
+        with open(path, "wb") as file:
+            file.write(MSGPACK_MAGIC)
+            for record in records:
+                file.write(packer.pack(record))
+
+    def append(self, records, path):
+        self._require()
+        packer = msgpack.Packer()
+        with open(path, "ab") as file:
+            for record in records:
+                file.write(packer.pack(record))
+
+    def load(self, path):
+        return list(self.iter_load(path))
+
+    def iter_load(self, path, chunk_size=65536):
+        yield from self.iter_tail(path, len(MSGPACK_MAGIC), chunk_size)
+
+    def tail_offset(self, path):
+        """Позиция в байтах, после которой append дописывает новые записи."""
+        return os.path.getsize(path)
+
+    def iter_tail(self, path, offset, chunk_size=65536):
+        """Записи, дописанные после позиции offset из tail_offset."""
+        self._require()
+        with open(path, "rb") as file:
+            file.seek(offset)
+            yield from msgpack.Unpacker(file, raw=False, read_size=chunk_size)
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (
+        JsonSerializer(),
+        CompactJsonSerializer(),
+        OrjsonSerializer(),
+        JsonLinesSerializer(),
+        MsgpackSerializer(),
+    )
+}
+
+
+def get_serializer(name):
+    """
+    Сериализатор по названию формата.
+
+    :param name: json, json-compact, orjson, jsonl или msgpack.
+    :return: Объект сериализатора.
+    """
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный формат '{name}'. Доступные форматы: {', '.join(SERIALIZERS)}"
+        ) from None
+
+
+def detect_serializer(path):
+    """
+    Определение формата файла по его началу. Массив без отступов
+    (json-compact или orjson) отличается от массива с отступами тем, что
+    первый элемент идёт сразу за скобкой; такой файл дописывается тоже
+    без отступов, через orjson, если он установлен.
+
+    :param path: Путь к файлу.
+    :return: Сериализатор или None, если файла нет или он пуст.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        head = file.read(4096)
+    if head.startswith(MSGPACK_MAGIC):
+        return SERIALIZERS["msgpack"]
+    text = head.lstrip(b"\xef\xbb\xbf").lstrip()
+    if not text:
+        return None
+    if text.startswith(b"{"):
+        return SERIALIZERS["jsonl"]
+    if text.startswith(b"[{"):
+        return SERIALIZERS["orjson" if orjson is not None else "json-compact"]
+    return SERIALIZERS["json"]
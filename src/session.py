@@ -0,0 +1,81 @@
+from src.indexes import DateIndex, KeywordIndex, SalaryIndex, file_version
+from src.querycache import QueryCache
+from src.table import VacancyTable
+
+
+class DatasetCache:
+    """
+    Кэш загруженных вакансий и построенных по ним индексов на время работы
+    программы. Данные перечитываются, только если файл хранилища изменился
+    (по времени изменения и размеру); вместе с ними сбрасываются индексы
+    и кэш результатов запросов.
+
+    :param file_worker: Хранилище, из которого загружаются вакансии.
+    :param storage_file: Путь к файлу хранилища.
+    :param query_cache: Кэш результатов запросов; по умолчанию новый QueryCache.
+        Кэш привязывается к storage_file.
+    """
+
+    def __init__(self, file_worker, storage_file, query_cache=None):
+        self.file_worker = file_worker
+        self.storage_file = storage_file
+        self.version = None
+        self.loaded = False
+        self.vacancies = []
+        self.indexes = {}
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
+        self.query_cache.path = storage_file
+
+    def get_vacancies(self):
+        """
+        Вакансии из хранилища; при изменении файла загружаются заново.
+
+        :return: Список объектов Vacancy.
+        """
+        version = file_version(self.storage_file)
+        if not self.loaded or version != self.version:
+            self.vacancies = self.file_worker.load()
+            self.version = version
+            self.loaded = True
+            self.indexes.clear()
+            self.query_cache.set_version(version)
+        return self.vacancies
+
+    def get_index(self, name, build):
+        """
+        Индекс, построенный по текущим вакансиям. Строится один раз
+        для каждой версии файла хранилища.
+
+        :param name: Название индекса.
+        :param build: Функция, строящая индекс по списку вакансий.
+        :return: Объект индекса.
+        """
+        vacancies = self.get_vacancies()
+        if name not in self.indexes:
+            self.indexes[name] = build(vacancies)
+        return self.indexes[name]
+
+    def salary_index(self):
+        """Индекс по зарплате."""
+        return self.get_index("salary", SalaryIndex.build)
+
+    def date_index(self):
+        """Индекс по дате публикации."""
+        return self.get_index("date", DateIndex.build)
+
+    def table(self):
+        """Колоночная таблица вакансий для топ-N, отбора по зарплате и по дате."""
+        return self.get_index("table", VacancyTable.from_vacancies)
+
+    def keyword_index(self):
+        """Инвертированный индекс слов, сохраняемый рядом с файлом хранилища."""
+        return self.get_index(
+            "keyword",
+            lambda vacancies: KeywordIndex.for_file(self.storage_file, vacancies),
+        )
+
+    def invalidate(self):
+        """Сброс кэша: при следующем обращении данные загрузятся заново."""
+        self.loaded = False
+        self.indexes.clear()
+        self.query_cache.invalidate()
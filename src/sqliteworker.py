@@ -0,0 +1,221 @@
+import sqlite3
+from contextlib import closing
+
+from src.fileworker import AbstractFileWorker
+from src.vacancy import Vacancy
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    published_at TEXT,
+    published_ord INTEGER NOT NULL DEFAULT 0,
+    city TEXT,
+    salary_from INTEGER,
+    salary_to INTEGER,
+    currency TEXT,
+    salary_rub INTEGER,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_rub ON vacancies (salary_rub);
+CREATE INDEX IF NOT EXISTS idx_vacancies_published ON vacancies (published_ord);
+CREATE INDEX IF NOT EXISTS idx_vacancies_city ON vacancies (city);
+"""
+
+# Базы прежней версии хранили только зарплату в рублях, 0 - если не указана
+MIGRATION = """
+ALTER TABLE vacancies ADD COLUMN salary_from INTEGER;
+ALTER TABLE vacancies ADD COLUMN salary_to INTEGER;
+ALTER TABLE vacancies ADD COLUMN currency TEXT;
+ALTER TABLE vacancies ADD COLUMN salary_rub INTEGER;
+UPDATE vacancies SET salary_from = NULLIF(salary, 0), salary_rub = NULLIF(salary, 0);
+DROP INDEX IF EXISTS idx_vacancies_salary;
+"""
+
+COLUMNS = (
+    "title, published_at, city, salary_from, salary_to, currency, salary_rub, "
+    "description, url"
+)
+
+
+class SQLiteWorker(AbstractFileWorker):
+    """
+    Хранилище вакансий в базе SQLite.
+    Фильтрация, сортировка и отбор топ-N выполняются запросами к базе,
+    поэтому читаются только подходящие строки. Зарплата хранится как
+    вилка с валютой и суммой в рублях на момент сохранения; если зарплата
+    или курс валюты неизвестны, сумма в рублях - NULL.
+
+    :param file_db: Путь к файлу базы данных.
+    """
+
+    def __init__(self, file_db):
+        self.file_db = file_db
+        with closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+            columns = [
+                row[1] for row in connection.execute("PRAGMA table_info(vacancies)")
+            ]
+            if "salary_rub" not in columns:
+                connection.executescript(MIGRATION)
+            connection.executescript(INDEXES)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.file_db)
+        connection.create_function(
+            "casefold",
+            1,
+            lambda value: value.casefold() if value else "",
+            deterministic=True,
+        )
+        return connection
+
+    def save(self, vacancies):
+        """
+        Сохранение вакансий в базу.
+        Вакансии с уже сохранённой ссылкой не добавляются.
+
+        :param vacancies: Список вакансий для сохранения.
+        """
+        rows = [
+            (
+                vacancy.title,
+                vacancy.published_at,
+                vacancy.published_ord,
+                vacancy.city,
+                vacancy.salary_from,
+                vacancy.salary_to,
+                vacancy.currency,
+                vacancy.salary_rub,
+                vacancy.description,
+                vacancy.url,
+            )
+            for vacancy in vacancies
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO vacancies "
+                "(title, published_at, published_ord, city, salary_from, salary_to, "
+                "currency, salary_rub, description, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @staticmethod
+    def _vacancy(row):
+        """Вакансия из строки запроса; сумма в рублях берётся из базы"""
+        (
+            title,
+            published_at,
+            city,
+            salary_from,
+            salary_to,
+            currency,
+            salary_rub,
+            description,
+            url,
+        ) = row
+        salary = {"from": salary_from, "rub": salary_rub}
+        if salary_to is not None:
+            salary["to"] = salary_to
+        if currency is not None:
+            salary["currency"] = currency
+        return Vacancy.from_trusted(
+            {
+                "name": title,
+                "published_at": published_at,
+                "city": city,
+                "salary": salary,
+                "snippet": {"requirement": description},
+                "alternate_url": url,
+            }
+        )
+
+    def _query(self, where="", order="id", limit=None, params=()):
+        sql = f"SELECT {COLUMNS} FROM vacancies"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        with closing(self._connect()) as connection:
+            return [self._vacancy(row) for row in connection.execute(sql, params)]
+
+    def load(self):
+        """
+        Загрузка всех вакансий в порядке добавления.
+
+        :return: Список объектов Vacancy.
+        """
+        return self._query()
+
+    def iter_load(self):
+        """
+        Потоковая загрузка вакансий: строки читаются курсором по мере обхода.
+
+        :return: Генератор объектов Vacancy.
+        """
+        with closing(self._connect()) as connection:
+            for row in connection.execute(
+                f"SELECT {COLUMNS} FROM vacancies ORDER BY id"
+            ):
+                yield self._vacancy(row)
+
+    def filter_by_salary(self, min_salary, max_salary):
+        """Вакансии с зарплатой в заданном диапазоне, по возрастанию зарплаты."""
+        return self._query(
+            "salary_rub BETWEEN ? AND ?",
+            "salary_rub, id",
+            params=(min_salary, max_salary),
+        )
+
+    def get_top_n(self, n):
+        """Топ n вакансий по зарплате; NULL в SQLite меньше любого числа,
+        поэтому вакансии без зарплаты - в конце."""
+        return self._query(order="salary_rub DESC, id", limit=n)
+
+    def sort_by_date(self):
+        """Вакансии от новых к старым."""
+        return self._query(order="published_ord DESC, id")
+
+    def filter_by_city(self, city):
+        """Вакансии в заданном городе."""
+        return self._query("city = ?", params=(city,))
+
+    def filter_by_keywords(self, words):
+        """Вакансии, в названии или описании которых встречаются все слова."""
+        words = [word.casefold() for word in words if word]
+        where = " AND ".join(
+            "instr(casefold(title || ' ' || description), ?) > 0" for _ in words
+        )
+        return self._query(where, params=tuple(words))
+
+    def count(self):
+        """Количество сохранённых вакансий."""
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    def clear(self):
+        """Удаление всех вакансий из базы."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM vacancies")
+
+    def clear_data(self):
+        """
+        Удаляет все вакансии из базы.
+        Запрашивает подтверждение у пользователя перед удалением.
+        """
+        answer = input("Удалить вакансии (да/нет): ")
+        if answer.lower() == "да":
+            try:
+                self.clear()
+                print("Все данные из базы успешно удалены.")
+            except sqlite3.Error as e:
+                print(f"Ошибка при удалении данных: {e}")
+        else:
+            print("Удаление отменено.")
@@ -0,0 +1,183 @@
+import heapq
+import sys
+from array import array
+from datetime import date
+from itertools import compress
+
+from src.fileworker import FileWorker
+from src.indexes import SalaryIndex
+from src.vacancy import Vacancy
+
+
+class VacancyTable:
+    """
+    Колоночное представление вакансий.
+    Зарплаты (в рублях и исходная вилка) и даты публикации хранятся
+    в массивах array целых чисел с масками известных значений, названия
+    городов и коды валют интернируются, поэтому на каждую вакансию
+    не создаётся отдельный объект. Строка даты восстанавливается
+    по published_ord; исходные строки хранятся только для дат в другом
+    формате. Операции возвращают позиции строк, а объекты Vacancy
+    создаются только по запросу.
+
+    Методы filter_by_salary, get_top_n и sort_by_date возвращают вакансии,
+    поэтому таблицу можно передавать вместо списка в функции Vacancy,
+    как и SQLiteWorker.
+    """
+
+    DATE_FORMAT = "%d.%m.%Y"
+
+    def __init__(self):
+        self.titles = []
+        self.published_ord = array("q")
+        self.raw_dates = {}
+        self.cities = []
+        self.salaries = array("q")
+        self.salary_known = bytearray()
+        self.salary_from = array("q")
+        self.salary_from_known = bytearray()
+        self.salary_to = array("q")
+        self.salary_to_known = bytearray()
+        self.currencies = []
+        self.descriptions = []
+        self.urls = []
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, vacancy):
+        """Добавление вакансии в таблицу."""
+        position = len(self)
+        self.titles.append(vacancy.title)
+        self.published_ord.append(vacancy.published_ord)
+        if vacancy.published_at != self.format_date(vacancy.published_ord):
+            self.raw_dates[position] = vacancy.published_at
+        self.cities.append(sys.intern(vacancy.city) if vacancy.city else vacancy.city)
+        self.salaries.append(vacancy.salary_value)
+        self.salary_known.append(SalaryIndex.salary_of(vacancy) is not None)
+        self.salary_from.append(vacancy.salary_from or 0)
+        self.salary_from_known.append(vacancy.salary_from is not None)
+        self.salary_to.append(vacancy.salary_to or 0)
+        self.salary_to_known.append(vacancy.salary_to is not None)
+        self.currencies.append(
+            sys.intern(vacancy.currency) if vacancy.currency else vacancy.currency
+        )
+        self.descriptions.append(vacancy.description)
+        self.urls.append(vacancy.url)
+
+    @classmethod
+    def from_vacancies(cls, vacancies):
+        """
+        Построение таблицы по вакансиям.
+
+        :param vacancies: Итерируемый объект с вакансиями, в том числе поток.
+        :return: Объект VacancyTable.
+        """
+        table = cls()
+        for vacancy in vacancies:
+            table.append(vacancy)
+        return table
+
+    @classmethod
+    def from_file(cls, file_json):
+        """
+        Построение таблицы по файлу FileWorker без загрузки всего списка.
+        Формат файла определяется по его содержимому.
+
+        :param file_json: Путь к файлу с вакансиями.
+        :return: Объект VacancyTable.
+        """
+        return cls.from_vacancies(FileWorker(file_json).iter_load())
+
+    @classmethod
+    def format_date(cls, ordinal):
+        """Строка даты по порядковому номеру дня или None для 0."""
+        return date.fromordinal(ordinal).strftime(cls.DATE_FORMAT) if ordinal else None
+
+    def published_at(self, position):
+        """Дата публикации в строке position в исходном виде."""
+        if position in self.raw_dates:
+            return self.raw_dates[position]
+        return self.format_date(self.published_ord[position])
+
+    def row(self, position):
+        """Вакансия в строке position."""
+        salary = {
+            "from": (
+                self.salary_from[position] if self.salary_from_known[position] else None
+            ),
+            "rub": self.salaries[position] if self.salary_known[position] else None,
+        }
+        if self.salary_to_known[position]:
+            salary["to"] = self.salary_to[position]
+        if self.currencies[position] is not None:
+            salary["currency"] = self.currencies[position]
+        return Vacancy.from_trusted(
+            {
+                "name": self.titles[position],
+                "published_at": self.published_at(position),
+                "city": self.cities[position],
+                "salary": salary,
+                "snippet": {"requirement": self.descriptions[position]},
+                "alternate_url": self.urls[position],
+            }
+        )
+
+    def vacancies(self, positions=None):
+        """
+        Объекты Vacancy для заданных строк.
+
+        :param positions: Позиции строк; по умолчанию все строки.
+        :return: Список вакансий.
+        """
+        if positions is None:
+            positions = range(len(self))
+        return [self.row(position) for position in positions]
+
+    def filter_salary(self, min_salary, max_salary):
+        """Позиции вакансий с указанной зарплатой в заданном диапазоне."""
+        mask = map(
+            lambda salary, known: known and min_salary <= salary <= max_salary,
+            self.salaries,
+            self.salary_known,
+        )
+        return list(compress(range(len(self)), mask))
+
+    def filter_city(self, city):
+        """Позиции вакансий в заданном городе."""
+        city = sys.intern(city)
+        return [position for position, name in enumerate(self.cities) if name is city]
+
+    def filter_keywords(self, words):
+        """Позиции вакансий, в названии или описании которых есть все слова."""
+        words = [word.lower() for word in words if word]
+        return [
+            position
+            for position, (title, description) in enumerate(
+                zip(self.titles, self.descriptions)
+            )
+            if all(word in f"{title} {description}".lower() for word in words)
+        ]
+
+    def date_order(self, reverse=True):
+        """Позиции вакансий, упорядоченные по дате публикации."""
+        return sorted(
+            range(len(self)), key=self.published_ord.__getitem__, reverse=reverse
+        )
+
+    def top_n(self, n):
+        """Позиции n вакансий с наибольшей зарплатой."""
+        return heapq.nlargest(n, range(len(self)), key=self.salaries.__getitem__)
+
+    def filter_by_salary(self, min_salary, max_salary):
+        """Вакансии с зарплатой в диапазоне по возрастанию зарплаты, как SalaryIndex."""
+        positions = self.filter_salary(min_salary, max_salary)
+        return self.vacancies(sorted(positions, key=self.salaries.__getitem__))
+
+    def get_top_n(self, n):
+        """n вакансий с наибольшей зарплатой."""
+        return self.vacancies(self.top_n(n))
+
+    def sort_by_date(self):
+        """Вакансии от новых к старым, как DateIndex.ordered(reverse=True)."""
+        return self.vacancies(self.date_order())
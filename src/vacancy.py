@@ -1,18 +1,51 @@
+import hashlib
+import heapq
 import re
-from datetime import datetime
+import time
+from datetime import date, datetime
+from operator import attrgetter
+
+from src.indexes import DateIndex, SalaryIndex
+from src.metrics import metrics
+from src.salary import normalize, parse_amount
+
+VACANCY_ID_RE = re.compile(r"/vacancy/(\d+)")
 
 
 class Vacancy:
     """Класс для работы с вакансиями"""
 
-    __slots__ = ["title", "published_at", "city", "salary", "description", "url"]
+    __slots__ = [
+        "title",
+        "_published_at",
+        "published_ord",
+        "city",
+        "_salary",
+        "salary_from",
+        "salary_to",
+        "currency",
+        "salary_rub",
+        "salary_value",
+        "description",
+        "url",
+    ]
 
     def __init__(
-        self, title, published_at, city: str, salary=None, description=None, url=None
+        self,
+        title,
+        published_at,
+        city: str,
+        salary=None,
+        description=None,
+        url=None,
+        salary_to=None,
+        currency=None,
     ):
         self.title = title
         self.published_at = published_at
         self.city = city
+        self.salary_to = parse_amount(salary_to)
+        self.currency = currency
         self.salary = salary if salary is not None else "Зарплата не указана"
         self.description = description
         self.url = url
@@ -27,20 +60,84 @@ class Vacancy:
         if not isinstance(self.description, str):
             raise ValueError("Описание должно быть строкой.")
 
+    @property
+    def published_at(self):
+        return self._published_at
+
+    @published_at.setter
+    def published_at(self, value):
+        """При присваивании даты сразу вычисляется её порядковый номер дня"""
+        self._published_at = value
+        self.published_ord = self.parse_date_ordinal(value)
+
+    @staticmethod
+    def parse_date_ordinal(published_at):
+        """Метод преобразования даты публикации в порядковый номер дня.
+        Возвращает 0, если дату не удалось разобрать."""
+        if isinstance(published_at, date):
+            return published_at.toordinal()
+        if not isinstance(published_at, str):
+            return 0
+        if len(published_at) == 10 and published_at[2] == published_at[5] == ".":
+            try:
+                return date(
+                    int(published_at[6:]), int(published_at[3:5]), int(published_at[:2])
+                ).toordinal()
+            except ValueError:
+                pass
+        for date_format in ("%d.%m.%Y", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(published_at, date_format).toordinal()
+            except ValueError:
+                pass
+        try:
+            return datetime.fromisoformat(published_at).toordinal()
+        except ValueError:
+            return 0
+
+    @property
+    def salary(self):
+        return self._salary
+
+    @salary.setter
+    def salary(self, value):
+        """При присваивании зарплаты сразу разбирается её нижняя граница
+        и вычисляется значение в рублях для сравнения и поиска"""
+        self._salary = value
+        self.salary_from = parse_amount(value)
+        self.salary_rub = normalize(self.salary_from, self.salary_to, self.currency)
+        self.salary_value = self.salary_rub or 0
+
     def __lt__(self, other):
-        return self.get_salary() < other.get_salary()
+        return self.salary_value < other.salary_value
 
     def __gt__(self, other):
-        return self.get_salary() > other.get_salary()
+        return self.salary_value > other.salary_value
 
     def get_salary(self):
         """Метод ппеобразования  зарплаты в числовой формат"""
-        if self.salary is None or not isinstance(self.salary, (int, str)):
-            return 0
-        if isinstance(self.salary, str):
-            salary_value = re.sub(r"[^\d]", "", self.salary)
-            return int(salary_value) if salary_value.isdigit() else 0
-        return self.salary
+        return self.salary_value
+
+    @property
+    def vacancy_id(self):
+        """Идентификатор вакансии hh.ru из ссылки или None"""
+        match = VACANCY_ID_RE.search(self.url)
+        return int(match.group(1)) if match else None
+
+    @property
+    def dedup_key(self):
+        """Уникальный ключ вакансии: идентификатор hh.ru, а для прочих ссылок -
+        64-битный хэш ссылки со старшим битом, чтобы не совпасть с идентификатором"""
+        return Vacancy.key_for_url(self.url)
+
+    @staticmethod
+    def key_for_url(url):
+        """Ключ dedup_key для вакансии с указанной ссылкой"""
+        match = VACANCY_ID_RE.search(url)
+        if match:
+            return int(match.group(1))
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") | (1 << 63)
 
     def to_dict(self):
         """Метод возвращает словарь, где ключи соответствуют полям
@@ -49,22 +146,115 @@ class Vacancy:
             "name": self.title,
             "published_at": self.published_at,
             "city": self.city,
-            "salary": {"from": self.salary},
+            "salary": self.salary_dict(),
             "snippet": {"requirement": self.description},
             "alternate_url": self.url,
         }
 
+    def salary_dict(self):
+        """Зарплата в формате hh.ru: верхняя граница и валюта - если известны.
+        Для зарплаты в валюте сохраняется и сумма в рублях по курсу на момент
+        получения вакансии (rub), чтобы при загрузке её не пересчитывать"""
+        salary = {"from": self.salary}
+        if self.salary_to is not None:
+            salary["to"] = self.salary_to
+        if self.currency is not None:
+            salary["currency"] = self.currency
+            salary["rub"] = self.salary_rub
+        return salary
+
+    def salary_text(self):
+        """Зарплата для вывода: вилка, валюта и сумма в рублях для других валют"""
+        if self.salary_from is None and self.salary_to is None:
+            return "Зарплата не указана"
+        if self.salary_to is None:
+            text = str(self.salary_from)
+        elif self.salary_from is None:
+            text = f"до {self.salary_to}"
+        else:
+            text = f"{self.salary_from}-{self.salary_to}"
+        if self.currency is None:
+            return text
+        if self.currency in ("RUR", "RUB"):
+            return f"{text} руб."
+        if self.salary_rub is None:
+            return f"{text} {self.currency} (курс неизвестен)"
+        return f"{text} {self.currency} (~{self.salary_rub} руб.)"
+
+    @classmethod
+    def from_dict(cls, item):
+        """Создание вакансии из словаря в формате to_dict"""
+        salary_info = item.get("salary") or {}
+        return cls(
+            item["name"],
+            item["published_at"],
+            item["city"],
+            salary_info["from"] if "from" in salary_info else 0,
+            item["snippet"]["requirement"],
+            item["alternate_url"],
+            salary_info.get("to"),
+            salary_info.get("currency"),
+        )
+
+    @classmethod
+    def from_trusted(cls, item):
+        """Быстрое создание вакансии из записи собственного хранилища.
+        Записи проверялись при сохранении, поэтому __init__ и валидация
+        не вызываются, а поля заполняются напрямую"""
+        vacancy = cls.__new__(cls)
+        salary_info = item.get("salary") or {}
+        salary = salary_info.get("from", 0)
+        if salary is None:
+            salary = "Зарплата не указана"
+        vacancy.title = item["name"]
+        vacancy._published_at = item["published_at"]
+        vacancy.published_ord = cls.parse_date_ordinal(vacancy._published_at)
+        vacancy.city = item["city"]
+        vacancy._salary = salary
+        salary_from = salary if type(salary) is int else parse_amount(salary)
+        vacancy.salary_from = salary_from
+        if "to" in salary_info or "currency" in salary_info or "rub" in salary_info:
+            vacancy.salary_to = parse_amount(salary_info.get("to"))
+            vacancy.currency = salary_info.get("currency")
+            if "rub" in salary_info:
+                salary_from = salary_info["rub"]
+            else:
+                salary_from = normalize(
+                    salary_from, vacancy.salary_to, vacancy.currency
+                )
+        else:
+            vacancy.salary_to = vacancy.currency = None
+        vacancy.salary_rub = salary_from
+        vacancy.salary_value = salary_from or 0
+        vacancy.description = item["snippet"]["requirement"]
+        vacancy.url = item["alternate_url"]
+        return vacancy
+
     @staticmethod
-    def filter_vacancies_by_keywords(vacancies):
-        """Сортирует вакансии по строке поиска"""
+    def filter_vacancies_by_keywords(vacancies, index=None, cache=None):
+        """Сортирует вакансии по строке поиска в названии и описании.
+        Если передан KeywordIndex, поиск выполняется по индексу,
+        если передан QueryCache - повторный запрос берётся из кэша,
+        если вместо списка передан SQLiteWorker - поиск выполняется в базе."""
         input_string = input("Введите ключевые слова для фильтрации вакансий: ")
-        filter_words = [word.strip() for word in input_string.split(" ")]
-        filtered_vacancies = []
-        for vacancy in vacancies:
-            if all(
-                word.lower() in vacancy.description.lower() for word in filter_words
-            ):
-                filtered_vacancies.append(vacancy)
+        filter_words = [word.strip().lower() for word in input_string.split(" ")]
+        filter_words = [word for word in filter_words if word]
+
+        def search():
+            if hasattr(vacancies, "filter_by_keywords"):
+                return vacancies.filter_by_keywords(filter_words)
+            if index is not None:
+                return index.search(filter_words, vacancies)
+            found = []
+            for vacancy in vacancies:
+                text = f"{vacancy.title} {vacancy.description}".lower()
+                if all(word in text for word in filter_words):
+                    found.append(vacancy)
+            return found
+
+        filtered_vacancies = Vacancy.cached(
+            cache, ("keywords", tuple(filter_words), index is not None), search
+        )
         if not filtered_vacancies:
             print("Нет вакансий по заданной строке поиска.")
         return filtered_vacancies
@@ -102,22 +292,27 @@ class Vacancy:
                 print("Ошибка: Пожалуйста, введите корректное число.")
 
     @staticmethod
-    def filter_vacancies_by_salary(vacancies):
-        """Сортирует вакансии по зарплате"""
+    def filter_vacancies_by_salary(vacancies, index=None, cache=None):
+        """Сортирует вакансии по зарплате.
+        Если SalaryIndex не передан, он строится по списку вакансий,
+        если передан QueryCache - повторный запрос берётся из кэша,
+        если вместо списка передан SQLiteWorker или VacancyTable - отбор
+        выполняется в базе или по колонкам таблицы."""
         min_salary, max_salary = Vacancy.get_valid()
-        filtered_vacancies = []
-        for vacancy in vacancies:
-            salary = vacancy.salary
-            if salary is None:
-                continue
-            if isinstance(salary, str):
-                salary = re.sub(r"[^\d]", "", salary)
-                if salary.isdigit():
-                    salary = int(salary)
-                else:
-                    continue
-            if isinstance(salary, (int, float)) and min_salary <= salary <= max_salary:
-                filtered_vacancies.append(vacancy)
+
+        def search():
+            nonlocal vacancies, index
+            if hasattr(vacancies, "filter_by_salary"):
+                return vacancies.filter_by_salary(min_salary, max_salary)
+            if not isinstance(vacancies, list):
+                vacancies = list(vacancies)
+            if index is None:
+                index = SalaryIndex.build(vacancies)
+            return index.search(min_salary, max_salary, vacancies)
+
+        filtered_vacancies = Vacancy.cached(
+            cache, ("salary", min_salary, max_salary), search
+        )
 
         if not filtered_vacancies:
             print("Нет вакансий в заданном диапазоне зарплат.")
@@ -128,30 +323,33 @@ class Vacancy:
         return filtered_vacancies
 
     @staticmethod
-    def get_top_n_vacancies(vacancies, n):
-        """Формирует список top n вакансий"""
-        return sorted(
-            vacancies,
-            key=lambda x: (
-                x.salary
-                if isinstance(x.salary, int)
-                else (
-                    int(x.salary)
-                    if isinstance(x.salary, str) and x.salary.isdigit()
-                    else 0
-                )
-            ),
-            reverse=True,
-        )[:n]
+    def get_top_n_vacancies(vacancies, n, cache=None):
+        """Формирует список top n вакансий за один проход по вакансиям.
+        Принимает любой итерируемый объект, в том числе поток из хранилища;
+        для SQLiteWorker и VacancyTable отбор выполняется в базе или по колонкам."""
+        if hasattr(vacancies, "get_top_n"):
+            return Vacancy.cached(cache, ("top_n", n), lambda: vacancies.get_top_n(n))
+        return Vacancy.cached(
+            cache,
+            ("top_n", n),
+            lambda: heapq.nlargest(n, vacancies, key=attrgetter("salary_value")),
+        )
+
+    @staticmethod
+    def cached(cache, key, compute):
+        """Результат запроса из QueryCache, а без кэша - вычисленный заново."""
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(key, compute)
 
     @staticmethod
-    def display_top_n_vacancies(vacancies):
+    def display_top_n_vacancies(vacancies, cache=None):
         """Запрашивает количество вакансий для вывода и выводит топ N вакансий."""
         while True:
             try:
                 n = int(input("Введите количество вакансий для вывода в топ N: "))
                 if n > 0:
-                    top_vacancies = Vacancy.get_top_n_vacancies(vacancies, n)
+                    top_vacancies = Vacancy.get_top_n_vacancies(vacancies, n, cache)
                     print("Топ вакансий по зарплате:")
                     Vacancy.print_vacancies(top_vacancies)
                     break
@@ -162,48 +360,136 @@ class Vacancy:
 
     @staticmethod
     def print_vacancies(top_vacancies):
-        """Функция для вывода вакансий на экран."""
+        """Функция для вывода вакансий на экран.
+        Вакансии могут приходить потоком из хранилища, поэтому в этап print
+        метрик входит только сам вывод, а получение вакансий из потока - нет"""
+        seconds = 0.0
         i = 1
         for v in top_vacancies:
+            start = time.perf_counter()
             print(
-                f"Вакансия № {i}: {v.title}, Дата: {v.published_at}, г.{v.city}, Зарплата: {v.salary},"
+                f"Вакансия № {i}: {v.title}, Дата: {v.published_at}, г.{v.city}, Зарплата: {v.salary_text()},"
                 f"Требования: {v.description}, Ссылка: {v.url}"
             )
+            seconds += time.perf_counter() - start
             i += 1
+        if metrics.enabled:
+            metrics.record("print", seconds)
 
     @staticmethod
-    def sort_vacancies_by_date(vacancies):
-        """Сортирует вакансии по дате публикации"""
-        for v in vacancies:
-            if isinstance(v.published_at, str):  # Изменено на точечную нотацию
-                try:
-                    v.published_at = datetime.strptime(v.published_at, "%d.%m.%Y")
-                except ValueError:
-                    print(f"Неверный формат даты для вакансии: {v.title}. Пропускаем.")
-                    v.published_at = None
-
-        sorted_vacancies = sorted(
-            vacancies,
-            key=lambda v: v.published_at if v.published_at else datetime.min,
-            reverse=True,
-        )
+    def sort_vacancies_by_date(vacancies, index=None, cache=None):
+        """Сортирует вакансии по дате публикации, от новых к старым.
+        Даты не разбираются повторно: используется published_ord или DateIndex,
+        а для SQLiteWorker и VacancyTable - сортировка в базе или по колонкам."""
+
+        def order():
+            nonlocal vacancies, index
+            if hasattr(vacancies, "sort_by_date"):
+                return vacancies.sort_by_date()
+            if not isinstance(vacancies, list):
+                vacancies = list(vacancies)
+            if index is None:
+                index = DateIndex.build(vacancies)
+            return index.ordered(vacancies, reverse=True)
+
+        sorted_vacancies = Vacancy.cached(cache, ("date",), order)
+
         print("Вакансии, отсортированные по дате:")
         if sorted_vacancies:
             for i, v in enumerate(sorted_vacancies, start=1):
-                title = v.title
-                published_at = (
-                    v.published_at.strftime("%d.%m.%Y")
-                    if isinstance(v.published_at, datetime)
-                    else v.published_at
-                )
-                city = v.city
-                salary = v.salary
-                description = v.description
-                url = v.url
-
+                if not v.published_ord:
+                    print(f"Неверный формат даты для вакансии: {v.title}.")
                 print(
-                    f"Вакансия № {i}: {title}, Дата: {published_at}, г.{city}, Зарплата: {salary}, "
-                    f"Требования: {description}, Ссылка: {url}"
+                    f"Вакансия № {i}: {v.title}, Дата: {v.published_at}, г.{v.city}, Зарплата: {v.salary_text()}, "
+                    f"Требования: {v.description}, Ссылка: {v.url}"
                 )
         else:
             print("Нет доступных вакансий.")
+        return sorted_vacancies
+
+
+class LazyVacancy:
+    """Представление записи хранилища в виде вакансии.
+    Поля берутся из исходного словаря при обращении, поэтому операции,
+    которым нужны только зарплата или дата, не создают объекты Vacancy"""
+
+    __slots__ = ["item"]
+
+    def __init__(self, item):
+        self.item = item
+
+    @property
+    def title(self):
+        return self.item["name"]
+
+    @property
+    def published_at(self):
+        return self.item["published_at"]
+
+    @property
+    def published_ord(self):
+        return Vacancy.parse_date_ordinal(self.item["published_at"])
+
+    @property
+    def city(self):
+        return self.item["city"]
+
+    @property
+    def salary(self):
+        salary_info = self.item.get("salary")
+        salary = salary_info.get("from", 0) if salary_info else 0
+        return salary if salary is not None else "Зарплата не указана"
+
+    @property
+    def salary_from(self):
+        salary = self.salary
+        return salary if type(salary) is int else parse_amount(salary)
+
+    @property
+    def salary_to(self):
+        salary_info = self.item.get("salary")
+        return parse_amount(salary_info.get("to")) if salary_info else None
+
+    @property
+    def currency(self):
+        salary_info = self.item.get("salary")
+        return salary_info.get("currency") if salary_info else None
+
+    @property
+    def salary_rub(self):
+        salary_info = self.item.get("salary")
+        if salary_info and "rub" in salary_info:
+            return salary_info["rub"]
+        return normalize(self.salary_from, self.salary_to, self.currency)
+
+    @property
+    def salary_value(self):
+        return self.salary_rub or 0
+
+    @property
+    def description(self):
+        return self.item["snippet"]["requirement"]
+
+    @property
+    def url(self):
+        return self.item["alternate_url"]
+
+    vacancy_id = Vacancy.vacancy_id
+    dedup_key = Vacancy.dedup_key
+    salary_text = Vacancy.salary_text
+
+    def get_salary(self):
+        return self.salary_value
+
+    def __lt__(self, other):
+        return self.salary_value < other.salary_value
+
+    def __gt__(self, other):
+        return self.salary_value > other.salary_value
+
+    def materialize(self):
+        """Полноценный объект Vacancy для этой записи"""
+        return Vacancy.from_trusted(self.item)
+
+    def to_dict(self):
+        return self.materialize().to_dict()
@@ -1,8 +1,10 @@
+import io
+import json
 import os
 
 import pytest
 
-from src.fileworker import FileWorker
+from src.fileworker import FileWorker, JsonLinesFileWorker
 from src.vacancy import Vacancy
 
 
@@ -72,6 +74,74 @@ def test_save_existing_vacancy(setup_file_worker):
     assert len(loaded_vacancies) == 1
 
 
+def test_save_keeps_same_title_with_different_ids(setup_file_worker):
+    worker, file_path = setup_file_worker
+
+    worker.save(
+        [
+            Vacancy(
+                "Штукатур-маляр",
+                "20.01.2025",
+                "Новокузнецк",
+                0,
+                "Опыт работы.",
+                "https://hh.ru/vacancy/115901556",
+            ),
+            Vacancy(
+                "Штукатур-маляр",
+                "27.01.2025",
+                "Москва",
+                65000,
+                "Ответственность.",
+                "https://hh.ru/vacancy/116313470",
+            ),
+        ]
+    )
+
+    assert len(worker.load()) == 2
+
+
+def test_save_appends_without_rewriting(setup_file_worker):
+    worker, file_path = setup_file_worker
+    worker.save([make_vacancy("Программист", "https://hh.ru/vacancy/1")])
+    with open(file_path, "rb") as file:
+        first_item = file.read(100)
+
+    worker.save([make_vacancy("Тестировщик", "https://hh.ru/vacancy/2")])
+
+    with open(file_path, "rb") as file:
+        assert file.read(100) == first_item
+    with open(file_path, encoding="utf-8") as file:
+        assert len(json.load(file)) == 2
+    assert os.path.exists(f"{file_path}.ids")
+
+
+def test_save_rebuilds_ids_after_external_change(setup_file_worker):
+    worker, file_path = setup_file_worker
+    worker.save([make_vacancy("Программист", "https://hh.ru/vacancy/1")])
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump([], file)
+
+    worker.save([make_vacancy("Программист", "https://hh.ru/vacancy/1")])
+
+    assert len(worker.load()) == 1
+
+
+def test_iter_lazy_top_n(setup_file_worker):
+    worker, file_path = setup_file_worker
+    worker.save(
+        [
+            make_vacancy(f"Вакансия {i}", f"https://hh.ru/vacancy/{i}", salary)
+            for i, salary in enumerate([50000, 120000, 80000])
+        ]
+    )
+
+    top = Vacancy.get_top_n_vacancies(worker.iter_lazy(), 2)
+
+    assert [v.title for v in top] == ["Вакансия 1", "Вакансия 2"]
+    assert isinstance(top[0].materialize(), Vacancy)
+
+
 def test_clear_data(setup_file_worker, monkeypatch):
     worker, file_path = setup_file_worker
 
@@ -92,9 +162,125 @@ def test_clear_data(setup_file_worker, monkeypatch):
     assert len(loaded_vacancies) == 1
 
 
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_load_matches_load(chunk_size, setup_file_worker):
+    worker, file_path = setup_file_worker
+    worker.save(
+        [
+            Vacancy(
+                f"Вакансия {i}",
+                "01.01.2023",
+                "Москва",
+                1000 * i,
+                "Требования: [опыт], {знания}",
+                f"http://example.com/{i}",
+            )
+            for i in range(20)
+        ]
+    )
+
+    streamed = list(worker.iter_load(chunk_size=chunk_size))
+
+    assert len(streamed) == 20
+    assert [v.to_dict() for v in streamed] == [v.to_dict() for v in worker.load()]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("[]", []),
+        (' [ 1 , {"a": [2, 3]} , "]" ]\n', [1, {"a": [2, 3]}, "]"]),
+        ("[12345]", [12345]),
+    ],
+)
+def test_iter_json_array(text, expected):
+    for chunk_size in (1, 3, 100):
+        items = FileWorker.iter_json_array(io.StringIO(text), chunk_size)
+        assert list(items) == expected
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "{}", "[1 2]"])
+def test_iter_json_array_invalid(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(FileWorker.iter_json_array(io.StringIO(text), 2))
+
+
 def test_parse_salary():
     assert FileWorker.parse_salary("50000") == 50000
     assert FileWorker.parse_salary("зарплата не указана") == 0
     assert FileWorker.parse_salary("abc") == 0
     assert FileWorker.parse_salary(None) == 0
     assert FileWorker.parse_salary(60000) == 60000
+
+
+@pytest.fixture
+def jsonl_worker(tmp_path):
+    return JsonLinesFileWorker(tmp_path / "vacancies.jsonl")
+
+
+def make_vacancy(title, url, salary=100000):
+    return Vacancy(title, "01.01.2023", "Москва", salary, "Знание Python", url)
+
+
+def test_save_appends_only_new_vacancies(jsonl_worker):
+    jsonl_worker.save([make_vacancy("Программист", "http://example.com/1")])
+    jsonl_worker.save(
+        [
+            make_vacancy("Программист", "http://example.com/1"),
+            make_vacancy("Тестировщик", "http://example.com/2"),
+        ]
+    )
+
+    with open(jsonl_worker.file_jsonl, encoding="utf-8") as file:
+        lines = file.readlines()
+    assert len(lines) == 2
+    assert [v.title for v in jsonl_worker.load()] == ["Программист", "Тестировщик"]
+
+
+def test_keys_rebuilt_when_sidecar_missing(jsonl_worker, tmp_path):
+    jsonl_worker.save([make_vacancy("Программист", "http://example.com/1")])
+    (tmp_path / "vacancies.jsonl.ids").unlink()
+
+    jsonl_worker.save([make_vacancy("Программист", "http://example.com/1")])
+
+    assert len(jsonl_worker.load()) == 1
+
+
+def test_compact_removes_duplicates_and_broken_lines(jsonl_worker):
+    record = json.dumps(make_vacancy("Программист", "http://example.com/1").to_dict())
+    with open(jsonl_worker.file_jsonl, "w", encoding="utf-8") as file:
+        file.write(record + "\n" + record + "\n{broken\n")
+
+    assert jsonl_worker.compact() == 1
+    assert len(jsonl_worker.load()) == 1
+    jsonl_worker.save(
+        [
+            make_vacancy("Программист", "http://example.com/1"),
+            make_vacancy("Тестировщик", "http://example.com/2"),
+        ]
+    )
+    assert [v.title for v in jsonl_worker.load()] == ["Программист", "Тестировщик"]
+
+
+def test_stale_id_index_is_rebuilt(jsonl_worker):
+    jsonl_worker.save([make_vacancy("Программист", "http://example.com/1")])
+    record = make_vacancy("Тестировщик", "http://example.com/2").to_dict()
+    with open(jsonl_worker.file_jsonl, "a", encoding="utf-8") as file:
+        file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    jsonl_worker.save([make_vacancy("Тестировщик", "http://example.com/2")])
+
+    assert len(jsonl_worker.load()) == 2
+
+
+def test_compact_json_array(tmp_path):
+    path = tmp_path / "vacancies.json"
+    record = make_vacancy("Программист", "http://example.com/1").to_dict()
+    path.write_text(json.dumps([record, record]), encoding="utf-8")
+
+    assert FileWorker(path).compact() == 1
+    assert len(FileWorker(path).load()) == 1
+
+
+def test_load_missing_file(jsonl_worker):
+    assert jsonl_worker.load() == []
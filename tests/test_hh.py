@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -6,8 +6,9 @@ from src.hh import HHAPI
 
 
 @pytest.fixture
-def hh_api():
-    return HHAPI()
+def hh_api(tmp_path):
+    HHAPI._area_indexes.clear()
+    return HHAPI(areas_cache=tmp_path / "areas.json")
 
 
 def test_get_area_id_success(hh_api):
@@ -16,13 +17,42 @@ def test_get_area_id_success(hh_api):
         {"id": 2, "name": "Санкт-Петербург"},
     ]
 
-    with patch("requests.get") as mock_get:
+    with patch.object(hh_api.session, "get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = mock_response
         area_id = hh_api.get_area_id("Москва")
         assert area_id == 1
 
 
+def test_get_area_id_uses_disk_cache(hh_api):
+    mock_response = [
+        {"id": 1, "name": "Россия", "areas": [{"id": 4, "name": "Новокузнецк"}]},
+    ]
+
+    with patch.object(hh_api.session, "get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = mock_response
+        assert hh_api.get_area_id("новокузнецк") == 4
+
+    HHAPI._area_indexes.clear()
+    other = HHAPI(areas_cache=hh_api.areas_cache)
+    with patch.object(other.session, "get") as mock_get:
+        assert other.get_area_id("НОВОКУЗНЕЦК") == 4
+        mock_get.assert_not_called()
+
+
+def test_build_area_index_nested():
+    areas = [
+        {
+            "id": 1,
+            "name": "Россия",
+            "areas": [{"id": 2, "name": "Москва", "areas": []}],
+        },
+        {"id": 3, "name": "Москва", "areas": []},
+    ]
+    assert HHAPI.build_area_index(areas) == {"россия": 1, "москва": 2}
+
+
 def test_find_area_id_success(hh_api):
     areas = [
         {"id": 1, "name": "Москва", "areas": []},
@@ -55,7 +85,10 @@ def test_fetch_and_save_vacancies(mocker, hh_api):
                 }
             ]
         }
-        with patch("requests.get") as mock_get:
+        with (
+            patch.object(hh_api.session, "get") as mock_get,
+            patch("src.hh.FileWorker.save"),
+        ):
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
 
@@ -66,3 +99,156 @@ def test_fetch_and_save_vacancies(mocker, hh_api):
             assert vacancies[0].salary == 100000
             assert vacancies[0].city == "Москва"
             assert vacancies[0].url == "http://example.com"
+
+
+def test_fetch_pages_keeps_order(hh_api):
+    def fake_get(url, params, timeout=None):
+        response = MagicMock(status_code=200)
+        response.page = params["page"]
+        return response
+
+    with patch.object(hh_api.session, "get", side_effect=fake_get):
+        responses = hh_api.fetch_pages()
+
+    assert [response.page for response in responses] == list(range(20))
+
+
+def test_fetch_pages_stops_at_last_page(hh_api):
+    def fake_get(url, params, timeout=None):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"items": [], "found": 250, "pages": 3}
+        response.page = params["page"]
+        return response
+
+    with patch.object(hh_api.session, "get", side_effect=fake_get) as mock_get:
+        responses = hh_api.fetch_pages()
+
+    assert [response.page for response in responses] == [0, 1, 2]
+    assert mock_get.call_count == 3
+
+
+def test_fetch_vacancies_narrows_on_server(hh_api):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        "items": [
+            {
+                "name": "PYTHON-разработчик",
+                "snippet": {"requirement": None},
+                "alternate_url": "http://example.com/1",
+            },
+            {
+                "name": "Бухгалтер",
+                "snippet": {"requirement": "1С"},
+                "alternate_url": "http://example.com/2",
+            },
+        ],
+        "found": 2,
+        "pages": 1,
+    }
+
+    with (
+        patch.object(hh_api, "get_area_id", return_value=1),
+        patch.object(hh_api.session, "get", return_value=response) as mock_get,
+    ):
+        vacancies = hh_api.fetch_vacancies(
+            "Москва", "Python", only_with_salary=True, period=7
+        )
+
+    assert [v.url for v in vacancies] == ["http://example.com/1"]
+    mock_get.assert_called_once_with(
+        hh_api.url,
+        params=dict(
+            hh_api.params,
+            area=1,
+            text="Python",
+            only_with_salary="true",
+            period=7,
+            page=0,
+        ),
+        timeout=hh_api.timeout,
+    )
+    assert hh_api.params["per_page"] == 100
+    assert hh_api.params["search_field"] == ["name", "description"]
+
+
+def test_fetch_page_uses_response_cache(tmp_path):
+    cache = MagicMock()
+    hh_api = HHAPI(areas_cache=tmp_path / "areas.json", response_cache=cache)
+
+    response = hh_api.fetch_page(3)
+
+    assert response is cache.get.return_value
+    cache.get.assert_called_once_with(
+        hh_api.session,
+        hh_api.url,
+        params=dict(hh_api.params, page=3),
+        timeout=hh_api.timeout,
+    )
+
+
+def test_harvest_dedupes_and_saves_once(hh_api):
+    def fake_get(url, params, timeout=None):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "items": [
+                {
+                    "name": f"{params['text']} в {params['area']}",
+                    "snippet": {"requirement": "Python"},
+                    "salary": None,
+                    "area": {"name": params["area"]},
+                    "alternate_url": f"http://example.com/{params['area']}",
+                    "published_at": "2023-09-01T10:00:00+0300",
+                }
+            ]
+        }
+        return response
+
+    storage = MagicMock()
+    hh_api.pages = 2
+    with (
+        patch.object(hh_api, "get_area_index", return_value={}),
+        patch.object(hh_api, "get_area_id", side_effect=lambda city: city),
+        patch.object(hh_api.session, "get", side_effect=fake_get),
+    ):
+        vacancies = hh_api.harvest(
+            [("Москва", "Python"), ("Казань", "Python"), ("Москва", "Django")],
+            storage,
+        )
+
+    assert [v.url for v in vacancies] == [
+        "http://example.com/Москва",
+        "http://example.com/Казань",
+    ]
+    storage.save.assert_called_once_with(vacancies)
+    assert hh_api.params["text"] == ""
+
+
+def test_harvest_passes_search_filters(hh_api):
+    with (
+        patch.object(hh_api, "get_area_index", return_value={}),
+        patch.object(hh_api, "fetch_vacancies", return_value=[]) as fetch,
+    ):
+        hh_api.harvest(
+            [("Москва", "Python")], MagicMock(), only_with_salary=True, period=3
+        )
+
+    fetch.assert_called_once_with("Москва", "Python", only_with_salary=True, period=3)
+
+
+def test_stream_and_save_asks_search_filters(mocker, hh_api):
+    mocker.patch("builtins.input", side_effect=["Москва", "Python", "да", "0", "7"])
+    storage = MagicMock()
+    with (
+        patch.object(hh_api, "update_currency_rates"),
+        patch.object(hh_api, "stream_vacancies", return_value=0) as stream,
+    ):
+        hh_api.stream_and_save_vacancies(storage)
+
+    stream.assert_called_once_with(
+        "Москва", "Python", storage, only_with_salary=True, period=7
+    )
+
+
+def test_get_search_filters_defaults(mocker, hh_api):
+    mocker.patch("builtins.input", side_effect=["", ""])
+    assert hh_api.get_search_filters() == (False, None)
@@ -0,0 +1,82 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from src.http_cache import ResponseCache
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        body = json.dumps({"items": [], "path": self.path}).encode("utf-8")
+        if self.path.startswith("/etag"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests_seen = []
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_revalidates_with_etag(server, tmp_path):
+    cache = ResponseCache(tmp_path)
+    session = requests.Session()
+
+    first = cache.get(session, f"{server}/etag", params={"page": 0})
+    second = cache.get(session, f"{server}/etag", params={"page": 0})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert len(Handler.requests_seen) == 2
+    assert cache.stats() == {"hits": 1, "misses": 1, "revalidated": 1}
+
+
+def test_ttl_without_validators(server, tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60)
+    session = requests.Session()
+
+    cache.get(session, f"{server}/plain", params={"page": 0})
+    cached = cache.get(session, f"{server}/plain", params={"page": 0})
+    cache.get(session, f"{server}/plain", params={"page": 1})
+
+    assert cached.from_cache
+    assert len(Handler.requests_seen) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_expired_entry_is_refetched(server, tmp_path):
+    cache = ResponseCache(tmp_path, ttl=0)
+    session = requests.Session()
+
+    cache.get(session, f"{server}/plain")
+    cache.get(session, f"{server}/plain")
+
+    assert len(Handler.requests_seen) == 2
+    assert cache.stats()["misses"] == 2
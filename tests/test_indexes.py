@@ -0,0 +1,136 @@
+from datetime import date
+
+import pytest
+
+from src.indexes import DateIndex, IdIndex, KeywordIndex, SalaryIndex
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def vacancies():
+    return [
+        Vacancy(
+            "Python-разработчик", "01.01.2023", "Москва", 1, "Опыт Django", "http://u1"
+        ),
+        Vacancy(
+            "Тестировщик", "01.01.2023", "Москва", 1, "Знание Python, SQL", "http://u2"
+        ),
+        Vacancy("Аналитик", "01.01.2023", "Казань", 1, "Знание SQL", "http://u3"),
+    ]
+
+
+def test_search_intersects_words(vacancies):
+    index = KeywordIndex.build(vacancies)
+    assert [v.title for v in index.search(["python", "sql"], vacancies)] == [
+        "Тестировщик"
+    ]
+
+
+def test_search_matches_substrings_and_titles(vacancies):
+    index = KeywordIndex.build(vacancies)
+    assert [v.title for v in index.search(["pyth"], vacancies)] == [
+        "Python-разработчик",
+        "Тестировщик",
+    ]
+
+
+def test_search_words_with_punctuation(vacancies):
+    index = KeywordIndex.build(vacancies)
+    assert [v.title for v in index.search(["python,"], vacancies)] == ["Тестировщик"]
+
+
+def test_search_no_match(vacancies):
+    index = KeywordIndex.build(vacancies)
+    assert index.search(["java"], vacancies) == []
+
+
+def test_for_file_persists_and_rebuilds(vacancies, tmp_path):
+    storage = tmp_path / "vacancies.json"
+    storage.write_text("[]", encoding="utf-8")
+
+    index = KeywordIndex.for_file(storage, vacancies)
+    assert (tmp_path / "vacancies.json.kwindex").exists()
+    assert KeywordIndex.for_file(storage, vacancies).postings == index.postings
+
+    storage.write_text("[ ]", encoding="utf-8")
+    rebuilt = KeywordIndex.for_file(storage, vacancies[:1])
+    assert rebuilt.size == 1
+
+
+def test_salary_index_range():
+    vacancies = [
+        Vacancy("А", "01.01.2023", "Москва", salary, "Описание", "http://u")
+        for salary in [50000, "30 000", None, "Зарплата не указана", 40000, 30000]
+    ]
+    index = SalaryIndex.build(vacancies)
+
+    assert index.salaries == [30000, 30000, 40000, 50000]
+    assert index.range(30000, 40000) == [1, 5, 4]
+    assert index.range(60000, 70000) == []
+    assert [v.salary for v in index.search(45000, 50000, vacancies)] == [50000]
+
+
+def test_date_index_order_and_range():
+    vacancies = [
+        Vacancy(f"В{i}", published_at, "Москва", 1, "Описание", "http://u")
+        for i, published_at in enumerate(
+            ["15.01.2023", "10.02.2023", "неверная_дата", "15.01.2023", "05.01.2023"]
+        )
+    ]
+    index = DateIndex.build(vacancies)
+
+    assert [v.title for v in index.ordered(vacancies, reverse=True)] == [
+        "В1",
+        "В0",
+        "В3",
+        "В4",
+        "В2",
+    ]
+    assert index.range(date(2023, 1, 10), date(2023, 1, 31)) == [0, 3]
+
+
+def test_id_index_add_and_reopen(tmp_path):
+    data_file = tmp_path / "vacancies.json"
+    data_file.write_text("[]", encoding="utf-8")
+    index = IdIndex(tmp_path / "vacancies.json.ids", data_file)
+
+    assert not index.open()
+    index.rebuild([30, 10, 20])
+    assert 20 in index and 15 not in index
+
+    data_file.write_text("[1]", encoding="utf-8")
+    index.add([15, 5])
+    index.close()
+
+    reopened = IdIndex(tmp_path / "vacancies.json.ids", data_file)
+    assert reopened.open()
+    assert all(key in reopened for key in [5, 10, 15, 20, 30])
+    assert len(reopened) == 5
+    reopened.close()
+
+
+def test_id_index_merges_log(tmp_path, monkeypatch):
+    data_file = tmp_path / "vacancies.json"
+    data_file.write_text("[]", encoding="utf-8")
+    monkeypatch.setattr(IdIndex, "MIN_LOG_SIZE", 2)
+    index = IdIndex(tmp_path / "vacancies.json.ids", data_file)
+    index.rebuild([])
+
+    index.add([3])
+    assert index.sorted_count == 0
+    index.add([2, 1])
+    assert index.sorted_count == 3
+    assert list(index._sorted) == [1, 2, 3]
+    index.close()
+
+
+def test_id_index_invalid_after_data_change(tmp_path):
+    data_file = tmp_path / "vacancies.json"
+    data_file.write_text("[]", encoding="utf-8")
+    index = IdIndex(tmp_path / "vacancies.json.ids", data_file)
+    index.rebuild([1])
+    index.close()
+
+    data_file.write_text("[1, 2]", encoding="utf-8")
+
+    assert not index.open()
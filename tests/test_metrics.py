@@ -0,0 +1,131 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.fileworker import FileWorker
+from src.hh import HHAPI
+from src.metrics import Metrics, enable_from_env, metrics
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable(trace_memory=False)
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    collector = Metrics()
+    with collector.stage("fetch"):
+        pass
+    collector.count("pages")
+
+    assert collector.report() == {
+        "stages": {},
+        "counters": {},
+        "peak_memory_bytes": None,
+    }
+
+
+def test_stage_and_counters():
+    collector = Metrics()
+    collector.enable(trace_memory=False)
+
+    @collector.timed("parse")
+    def parse():
+        return 42
+
+    assert parse() == 42
+    with collector.stage("parse"):
+        collector.count("items", 20)
+    collector.count("items")
+
+    report = collector.report()
+    assert report["stages"]["parse"]["calls"] == 2
+    assert report["counters"] == {"items": 21}
+    assert 'vacancy_stage_calls_total{stage="parse"} 2' in collector.to_prometheus()
+    assert 'vacancy_events_total{name="items"} 21' in collector.to_prometheus()
+
+
+def test_export(tmp_path):
+    collector = Metrics()
+    collector.enable(trace_memory=False)
+    collector.count("pages", 3)
+
+    collector.export(tmp_path / "report.json")
+    collector.export(tmp_path / "report.prom")
+
+    with open(tmp_path / "report.json", encoding="utf-8") as file:
+        assert json.load(file)["counters"] == {"pages": 3}
+    with open(tmp_path / "report.prom", encoding="utf-8") as file:
+        assert 'vacancy_events_total{name="pages"} 3' in file.read()
+
+
+def test_pipeline_is_instrumented(enabled_metrics, tmp_path, mocker):
+    HHAPI._area_indexes.clear()
+    hh_api = HHAPI(areas_cache=tmp_path / "areas.json")
+    mocker.patch.object(hh_api, "get_area_id", return_value=1)
+    response = MagicMock(status_code=200, content=b"{}")
+    response.json.return_value = {
+        "items": [
+            {
+                "name": "Python разработчик",
+                "snippet": {"requirement": "Python"},
+                "alternate_url": "https://hh.ru/vacancy/1",
+            }
+        ]
+    }
+    hh_api.pages = 2
+    mocker.patch.object(hh_api.session, "get", return_value=response)
+
+    vacancies = hh_api.fetch_vacancies("Москва", "python")
+    storage = FileWorker(tmp_path / "vacancies.json")
+    storage.save(vacancies)
+    storage.load()
+    mocker.patch("builtins.print")
+    Vacancy.print_vacancies(vacancies)
+
+    report = enabled_metrics.report()
+    assert set(report["stages"]) == {"fetch", "parse", "save", "load", "print"}
+    assert report["counters"] == {
+        "pages": 2,
+        "bytes": 4,
+        "items": 2,
+        "saved": 1,
+        "loaded": 1,
+    }
+
+
+def test_enable_does_not_trace_memory_by_default(monkeypatch):
+    collector = Metrics()
+    collector.enable()
+    assert not collector.trace_memory
+
+    monkeypatch.setenv("VACANCY_METRICS", "report.json")
+    monkeypatch.setenv("VACANCY_METRICS_MEMORY", "1")
+    monkeypatch.setattr("src.metrics.metrics", collector)
+
+    assert enable_from_env() == "report.json"
+    assert collector.trace_memory
+    collector.disable()
+
+
+def test_print_stage_excludes_upstream(enabled_metrics, mocker):
+    mocker.patch("builtins.print")
+    vacancy = Vacancy("Инженер", "", "Москва", 1, "Описание", "http://url")
+
+    def slow_stream():
+        for _ in range(2):
+            time.sleep(0.05)
+            yield vacancy
+
+    Vacancy.print_vacancies(slow_stream())
+
+    stage = enabled_metrics.report()["stages"]["print"]
+    assert stage["calls"] == 1
+    assert stage["seconds"] < 0.05
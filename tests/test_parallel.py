@@ -0,0 +1,67 @@
+import pytest
+
+from benchmarks.generator import generate_records
+from src.indexes import DateIndex, SalaryIndex
+from src.parallel import ParallelQuery, scan_chunk
+from src.recordstore import RecordStore
+from src.vacancy import Vacancy
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    vacancies = [Vacancy.from_dict(item) for item in generate_records(500, seed=3)]
+    store = RecordStore(tmp_path_factory.mktemp("parallel") / "vacancies.rec")
+    store.save(vacancies)
+    yield store, vacancies
+    store.close()
+
+
+def urls(vacancies):
+    return [vacancy.url for vacancy in vacancies]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_match_sequential(dataset, workers):
+    store, vacancies = dataset
+    text = [f"{v.title} {v.description}".lower() for v in vacancies]
+
+    with ParallelQuery(store, workers=workers) as query:
+        assert urls(query.top_n(7)) == urls(Vacancy.get_top_n_vacancies(vacancies, 7))
+        assert urls(query.sort_by_date()) == urls(
+            DateIndex.build(vacancies).ordered(vacancies, reverse=True)
+        )
+        assert urls(query.filter_by_salary(50000, 150000)) == urls(
+            SalaryIndex.build(vacancies).search(50000, 150000, vacancies)
+        )
+        assert urls(query.filter_by_keywords(["Python", "sql"])) == [
+            v.url
+            for v, line in zip(vacancies, text)
+            if "python" in line and "sql" in line
+        ]
+
+
+def test_unknown_operation(dataset):
+    store, _ = dataset
+    with pytest.raises(ValueError):
+        scan_chunk(store, "median", 0, 1, ())
+
+
+def test_pool_sees_records_saved_after_start(tmp_path):
+    vacancies = [Vacancy.from_dict(item) for item in generate_records(60, seed=5)]
+    store = RecordStore(tmp_path / "vacancies.rec")
+    store.save(vacancies[:30])
+
+    with ParallelQuery(store, workers=2) as query:
+        assert len(query.top_n(3)) == 3
+        store.save(vacancies[30:])
+        assert urls(query.top_n(5)) == urls(Vacancy.get_top_n_vacancies(vacancies, 5))
+        assert len(query.sort_by_date()) == 60
+    store.close()
+
+
+def test_result_is_lazy_sequence(dataset):
+    store, vacancies = dataset
+    result = ParallelQuery(store, workers=1).sort_by_date()
+    assert len(result) == len(vacancies)
+    assert urls(result[:3]) == urls(list(result)[:3])
+    assert result[-1].url == list(result)[-1].url
@@ -0,0 +1,142 @@
+import json
+import queue
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.hh import HHAPI
+from src.pipeline import HarvestPipeline
+
+
+@pytest.fixture
+def hh_api(tmp_path):
+    HHAPI._area_indexes.clear()
+    return HHAPI(areas_cache=tmp_path / "areas.json")
+
+
+def make_get(failing_pages=(), pages=4):
+    requested = []
+
+    def fake_get(url, params, timeout=None):
+        page = params["page"]
+        requested.append(page)
+        response = MagicMock(status_code=500 if page in failing_pages else 200)
+        response.json.return_value = {
+            "items": [
+                {
+                    "name": f"Python {page}-{i}",
+                    "snippet": {"requirement": "Python"},
+                    "alternate_url": f"https://hh.ru/vacancy/{page * 10 + i}",
+                }
+                for i in range(3)
+            ],
+            "pages": pages,
+        }
+        return response
+
+    return fake_get, requested
+
+
+def saved_urls(storage):
+    return [v.url for call in storage.save.call_args_list for v in call.args[0]]
+
+
+def test_stream_saves_in_batches(hh_api, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    storage = MagicMock()
+    fake_get, requested = make_get()
+
+    with (
+        patch.object(hh_api, "get_area_id", return_value=1),
+        patch.object(hh_api.session, "get", side_effect=fake_get),
+    ):
+        found = hh_api.stream_vacancies(
+            "Москва", "python", storage, checkpoint, batch_size=5
+        )
+
+    assert found == 12
+    assert sorted(requested) == [0, 1, 2, 3]
+    assert [len(call.args[0]) for call in storage.save.call_args_list] == [6, 6]
+    assert saved_urls(storage)[0] == "https://hh.ru/vacancy/0"
+    assert not checkpoint.exists()
+
+
+def test_interrupted_stream_resumes(hh_api, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    storage = MagicMock()
+    fake_get, _ = make_get(failing_pages=(2,))
+
+    with (
+        patch.object(hh_api, "get_area_id", return_value=1),
+        patch.object(hh_api.session, "get", side_effect=fake_get),
+        patch.object(hh_api.scheduler, "sleep"),
+        patch("builtins.print") as mock_print,
+    ):
+        found = hh_api.stream_vacancies("Москва", "python", storage, checkpoint)
+
+    assert found == 6
+    with open(checkpoint, encoding="utf-8") as file:
+        assert json.load(file)["next_page"] == 2
+    mock_print.assert_any_call(
+        "Сбор прерван: Ошибка запроса: 500. Повторный запуск продолжит со страницы 3."
+    )
+
+    storage = MagicMock()
+    fake_get, requested = make_get()
+    with (
+        patch.object(hh_api, "get_area_id", return_value=1),
+        patch.object(hh_api.session, "get", side_effect=fake_get),
+    ):
+        found = hh_api.stream_vacancies("Москва", "python", storage, checkpoint)
+
+    assert found == 6
+    assert sorted(requested) == [2, 3]
+    assert not checkpoint.exists()
+
+
+def test_checkpoint_is_ignored_for_other_query(tmp_path):
+    pipeline = HarvestPipeline(MagicMock(), MagicMock(), tmp_path / "checkpoint.json")
+    pipeline.save_checkpoint({"text": "python", "page": 0}, 5)
+
+    assert pipeline.load_checkpoint({"text": "python", "page": 0}) == 5
+    assert pipeline.load_checkpoint({"text": "java", "page": 0}) == 0
+
+
+def test_parse_error_stops_stream(hh_api, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    storage = MagicMock()
+    fake_get, _ = make_get()
+    parse_item = HHAPI.parse_item
+
+    def failing_parse(item, keyword):
+        if item["alternate_url"].endswith("/10"):
+            raise ValueError("неверная ссылка")
+        return parse_item(item, keyword)
+
+    with (
+        patch.object(hh_api, "get_area_id", return_value=1),
+        patch.object(hh_api.session, "get", side_effect=fake_get),
+        patch.object(hh_api, "parse_item", side_effect=failing_parse),
+        patch("builtins.print") as mock_print,
+    ):
+        found = hh_api.stream_vacancies("Москва", "python", storage, checkpoint)
+
+    assert found == 3
+    with open(checkpoint, encoding="utf-8") as file:
+        assert json.load(file)["next_page"] == 1
+    mock_print.assert_any_call(
+        "Сбор прерван: неверная ссылка. Повторный запуск продолжит со страницы 2."
+    )
+
+
+def test_receive_reports_dead_stages():
+    source = MagicMock()
+    source.get.side_effect = queue.Empty
+    source.get_nowait.side_effect = queue.Empty
+    stage = MagicMock()
+    stage.is_alive.return_value = False
+
+    page, error = HarvestPipeline._receive(source, [stage])
+
+    assert page is None
+    assert isinstance(error, RuntimeError)
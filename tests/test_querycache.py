@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.fileworker import FileWorker
+from src.querycache import QueryCache
+from src.session import DatasetCache
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def vacancies():
+    return [
+        Vacancy(
+            "Python-разработчик", "01.02.2025", "Москва", 150000, "SQL", "http://u1"
+        ),
+        Vacancy("Бухгалтер", "03.02.2025", "Казань", 60000, "1С", "http://u2"),
+        Vacancy("Тестировщик", "02.02.2025", "Москва", 90000, "Python", "http://u3"),
+    ]
+
+
+def test_lru_eviction_by_entries():
+    cache = QueryCache(max_entries=2)
+    cache.get_or_compute("a", lambda: [1])
+    cache.get_or_compute("b", lambda: [2])
+    cache.get_or_compute("a", lambda: [0])
+    cache.get_or_compute("c", lambda: [3])
+
+    assert cache.get_or_compute("a", lambda: [0]) == [1]
+    assert cache.get_or_compute("b", lambda: [0]) == [0]
+    assert cache.stats()["hits"] == 2
+
+
+def test_eviction_by_size():
+    large = list(range(100))
+    cache = QueryCache(max_bytes=QueryCache.size_of(large) + 1)
+    cache.get_or_compute("small", lambda: [1])
+    cache.get_or_compute("large", lambda: large)
+
+    assert len(cache) == 1
+    cache.get_or_compute("huge", lambda: list(range(10000)))
+    assert len(cache) == 1
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_vacancy_queries_are_cached(vacancies, mocker):
+    cache = QueryCache()
+    mocker.patch("builtins.print")
+    mocker.patch("builtins.input", return_value="python")
+    mocker.patch.object(Vacancy, "get_valid", return_value=(50000, 100000))
+
+    for _ in range(2):
+        top = Vacancy.get_top_n_vacancies(vacancies, 2, cache)
+        by_salary = Vacancy.filter_vacancies_by_salary(vacancies, cache=cache)
+        by_keywords = Vacancy.filter_vacancies_by_keywords(vacancies, cache=cache)
+        by_date = Vacancy.sort_vacancies_by_date(vacancies, cache=cache)
+
+    assert [v.url for v in top] == ["http://u1", "http://u3"]
+    assert [v.url for v in by_salary] == ["http://u2", "http://u3"]
+    assert [v.url for v in by_keywords] == ["http://u1", "http://u3"]
+    assert [v.url for v in by_date] == ["http://u2", "http://u3", "http://u1"]
+    assert cache.stats()["misses"] == 4
+    assert cache.stats()["hits"] == 4
+
+
+def test_save_and_clear_invalidate_cache(tmp_path, vacancies, mocker):
+    storage_file = tmp_path / "vacancies.json"
+    worker = FileWorker(storage_file)
+    worker.save(vacancies[:2])
+    dataset = DatasetCache(worker, storage_file)
+
+    top = Vacancy.get_top_n_vacancies(dataset.get_vacancies(), 1, dataset.query_cache)
+    assert len(dataset.query_cache) == 1
+
+    worker.save(vacancies[2:])
+    assert len(dataset.query_cache) == 0
+    assert Vacancy.get_top_n_vacancies(
+        dataset.get_vacancies(), 1, dataset.query_cache
+    ) == [v for v in dataset.get_vacancies() if v.url == top[0].url]
+
+    mocker.patch("builtins.input", return_value="да")
+    mocker.patch("builtins.print")
+    with patch("src.fileworker.file_json", storage_file):
+        FileWorker.clear_data()
+    assert len(dataset.query_cache) == 0
+
+
+def test_save_invalidates_only_caches_of_that_file(tmp_path, vacancies):
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    datasets = []
+    for path in (first, second):
+        FileWorker(path).save(vacancies[:2])
+        dataset = DatasetCache(FileWorker(path), path)
+        Vacancy.get_top_n_vacancies(dataset.get_vacancies(), 1, dataset.query_cache)
+        datasets.append(dataset)
+
+    FileWorker(first).save(vacancies[2:])
+
+    assert len(datasets[0].query_cache) == 0
+    assert len(datasets[1].query_cache) == 1
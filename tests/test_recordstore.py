@@ -0,0 +1,123 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.generator import generate_records
+from src.fileworker import FileWorker
+from src.recordstore import RecordStore
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def vacancies():
+    return [Vacancy.from_dict(item) for item in generate_records(45, seed=1)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RecordStore(tmp_path / "vacancies.rec")
+    yield store
+    store.close()
+
+
+def test_save_and_random_access(store, vacancies):
+    store.save(vacancies[:30])
+    store.save(vacancies[20:] + vacancies[:5])
+
+    assert len(store) == 45
+    assert store.get(44).to_dict() == vacancies[44].to_dict()
+    assert [v.url for v in store.page(3, page_size=20)] == [
+        v.url for v in vacancies[40:]
+    ]
+    assert store.page(4, page_size=20) == []
+    assert store.page_count(page_size=20) == 3
+    assert store.find_by_url(vacancies[7].url).to_dict() == vacancies[7].to_dict()
+    assert store.find_by_url("https://hh.ru/vacancy/1") is None
+    with pytest.raises(IndexError):
+        store.get(45)
+
+
+def test_data_file_is_json_lines(store, vacancies, tmp_path):
+    store.save(vacancies)
+    store.close()
+
+    loaded = FileWorker(tmp_path / "vacancies.rec").load()
+    assert [v.to_dict() for v in loaded] == [v.to_dict() for v in vacancies]
+
+
+def test_index_is_rebuilt(store, vacancies, tmp_path):
+    store.save(vacancies[:10])
+    store.close()
+    os.remove(tmp_path / "vacancies.rec.offsets")
+    with open(tmp_path / "vacancies.rec", "a", encoding="utf-8") as file:
+        file.write("не json\n")
+
+    reopened = RecordStore(tmp_path / "vacancies.rec")
+    assert len(reopened) == 10
+    assert reopened.find_by_url(vacancies[9].url).title == vacancies[9].title
+    reopened.close()
+
+
+def test_source_view_follows_source(tmp_path, vacancies):
+    source = tmp_path / "vacancies.json"
+    FileWorker(source).save(vacancies[:10])
+
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert len(store) == 10
+    FileWorker(source).save(vacancies[10:])
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert len(store) == 45
+        assert store.get(44).url == vacancies[44].url
+
+
+@pytest.mark.parametrize("file_format", ["json", "json-compact", "jsonl"])
+def test_source_view_imports_only_appended_tail(tmp_path, vacancies, file_format):
+    source = tmp_path / "vacancies.json"
+    worker = FileWorker(source, file_format)
+    worker.save(vacancies[:10])
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert len(store) == 10
+
+    worker.save(vacancies[10:])
+    with patch.object(RecordStore, "import_from") as import_from:
+        with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+            assert len(store) == 45
+            assert [v.url for v in store.page(3)] == [v.url for v in vacancies[40:]]
+    import_from.assert_not_called()
+
+
+def test_source_view_starts_from_empty_source(tmp_path, vacancies):
+    source = tmp_path / "vacancies.json"
+    with open(source, "w", encoding="utf-8") as file:
+        file.write("[]")
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert len(store) == 0
+
+    FileWorker(source).save(vacancies[:5])
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert [v.url for v in store.iter_load()] == [v.url for v in vacancies[:5]]
+
+
+def test_rewritten_source_is_imported_again(tmp_path, vacancies):
+    source = tmp_path / "vacancies.json"
+    FileWorker(source).save(vacancies[:10])
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert len(store) == 10
+
+    os.remove(source)
+    FileWorker(source).save(vacancies[20:25])
+    with RecordStore(tmp_path / "vacancies.rec", source=source) as store:
+        assert [v.url for v in store.iter_load()] == [v.url for v in vacancies[20:25]]
+
+
+def test_display_page(store, vacancies, mocker):
+    store.save(vacancies)
+    mocker.patch("builtins.input", side_effect=["abc", "9", "3"])
+    mock_print = mocker.patch("builtins.print")
+
+    store.display_page()
+
+    mock_print.assert_any_call("Страницы с таким номером нет.")
+    mock_print.assert_any_call("Страница 3 из 3:")
+    assert mock_print.call_count == 2 + 1 + 5
@@ -0,0 +1,183 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.hh import HHAPI
+from src.indexes import SalaryIndex
+from src.salary import CurrencyRates, normalize, parse_amount, rates
+from src.sqliteworker import SQLiteWorker
+from src.vacancy import LazyVacancy, Vacancy
+
+
+@pytest.fixture
+def usd_rate():
+    with patch.dict(rates.table(), {"USD": 100.0}):
+        yield
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (100000, 100000),
+        ("100 000", 100000),
+        (1500.5, 1500),
+        ("Зарплата не указана", None),
+        (None, None),
+        (True, None),
+    ],
+)
+def test_parse_amount(value, expected):
+    assert parse_amount(value) == expected
+
+
+def test_normalize(usd_rate):
+    assert normalize(1000, 2000, "USD") == 100000
+    assert normalize(None, 2000, "USD") == 200000
+    assert normalize(50000, None, "RUR") == 50000
+    assert normalize(50000, None, "XXX") is None
+    assert normalize(None, None, "USD") is None
+
+
+def test_currency_rates_cache(tmp_path):
+    cache_file = tmp_path / "currencies.json"
+    CurrencyRates(cache_file).update(
+        [{"code": "RUR", "rate": 1}, {"code": "USD", "rate": 0.0125}]
+    )
+
+    loaded = CurrencyRates(cache_file)
+    assert loaded.table()["USD"] == 80.0
+    assert loaded.to_rub(10, "USD") == 800
+
+
+def test_vacancy_salary_is_typed(usd_rate):
+    item = {
+        "name": "Python-разработчик",
+        "published_at": "01.02.2025",
+        "city": "Москва",
+        "salary": {"from": None, "to": 3000, "currency": "USD"},
+        "snippet": {"requirement": "Python"},
+        "alternate_url": "https://hh.ru/vacancy/1",
+    }
+    rub = Vacancy("Инженер", "", "Москва", "250 000", "Описание", "http://url")
+
+    for vacancy in (
+        Vacancy.from_dict(item),
+        Vacancy.from_trusted(item),
+        LazyVacancy(item),
+    ):
+        assert vacancy.salary_to == 3000
+        assert vacancy.currency == "USD"
+        assert vacancy.salary_rub == 300000
+        assert vacancy.salary_value == 300000
+        assert vacancy > rub
+        assert SalaryIndex.salary_of(vacancy) == 300000
+
+    assert Vacancy.from_trusted(item).to_dict()["salary"] == {
+        "from": "Зарплата не указана",
+        "to": 3000,
+        "currency": "USD",
+        "rub": 300000,
+    }
+    assert (
+        SalaryIndex.salary_of(Vacancy("А", "", "Москва", None, "Б", "http://u")) is None
+    )
+
+
+def test_salary_rub_is_kept_from_ingest(usd_rate):
+    vacancy = Vacancy(
+        "Инженер", "", "Москва", 1000, "Описание", "http://url", 2000, "USD"
+    )
+    item = vacancy.to_dict()
+
+    with patch.dict(rates.table(), {"USD": 50.0}):
+        assert Vacancy.from_trusted(item).salary_rub == 100000
+        assert LazyVacancy(item).salary_rub == 100000
+        assert Vacancy.from_dict(item).salary_rub == 50000
+
+
+def test_salary_text(usd_rate):
+    def text(salary, salary_to=None, currency=None):
+        return Vacancy(
+            "А", "", "Москва", salary, "Б", "http://u", salary_to, currency
+        ).salary_text()
+
+    assert text(None) == "Зарплата не указана"
+    assert text(100000) == "100000"
+    assert text(100000, 150000, "RUR") == "100000-150000 руб."
+    assert text(None, 3000, "USD") == "до 3000 USD (~300000 руб.)"
+    assert text(1000, None, "XXX") == "1000 XXX (курс неизвестен)"
+
+
+def test_parse_item_keeps_salary_range(usd_rate):
+    vacancy = HHAPI.parse_item(
+        {
+            "name": "Python-разработчик",
+            "snippet": {"requirement": "Python"},
+            "salary": {"from": 2000, "to": 3000, "currency": "USD"},
+            "alternate_url": "https://hh.ru/vacancy/2",
+        },
+        "python",
+    )
+
+    assert (vacancy.salary_from, vacancy.salary_to, vacancy.currency) == (
+        2000,
+        3000,
+        "USD",
+    )
+    assert vacancy.get_salary() == 200000
+
+
+def test_parse_item_without_salary(tmp_path):
+    vacancy = HHAPI.parse_item(
+        {
+            "name": "Python-разработчик",
+            "snippet": {"requirement": "Python"},
+            "salary": None,
+            "alternate_url": "https://hh.ru/vacancy/3",
+        },
+        "python",
+    )
+
+    assert vacancy.salary_from is None
+    assert vacancy.salary_rub is None
+    assert vacancy.salary_text() == "Зарплата не указана"
+    assert SalaryIndex.build([vacancy]).range(0, 1000) == []
+    worker = SQLiteWorker(tmp_path / "vacancies.db")
+    worker.save([vacancy])
+    assert worker.filter_by_salary(0, 1000) == []
+
+
+def test_update_currency_rates(tmp_path):
+    hh_api = HHAPI(areas_cache=tmp_path / "areas.json")
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"currency": [{"code": "EUR", "rate": 0.01}]}
+
+    with (
+        patch.object(rates, "cache_file", tmp_path / "currencies.json"),
+        patch.object(rates, "_table", None),
+        patch.object(hh_api.session, "get", return_value=response) as mock_get,
+    ):
+        assert hh_api.update_currency_rates()["EUR"] == 100.0
+        assert hh_api.update_currency_rates()["EUR"] == 100.0
+
+    mock_get.assert_called_once_with(
+        "https://api.hh.ru/dictionaries", timeout=hh_api.timeout
+    )
+
+
+def test_currency_rates_have_own_ttl(tmp_path):
+    cache_file = tmp_path / "currencies.json"
+    cache_file.write_text("{}", encoding="utf-8")
+    hh_api = HHAPI(areas_cache=tmp_path / "areas.json", currency_ttl=0)
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"currency": []}
+
+    with (
+        patch.object(rates, "cache_file", cache_file),
+        patch.object(rates, "_table", None),
+        patch.object(hh_api.session, "get", return_value=response) as mock_get,
+    ):
+        hh_api.update_currency_rates()
+
+    assert hh_api.areas_ttl > 0
+    mock_get.assert_called_once()
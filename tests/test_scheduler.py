@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.scheduler import RequestScheduler
+
+
+def make_response(status_code, retry_after=None):
+    response = MagicMock(status_code=status_code)
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def scheduler(sleeps):
+    return RequestScheduler(
+        max_retries=3,
+        base_delay=1.0,
+        sleep=sleeps.append,
+        clock=lambda: 0.0,
+        jitter=lambda: 1.0,
+    )
+
+
+def test_success_without_retries(scheduler, sleeps):
+    response = scheduler.request(lambda: make_response(200))
+    assert response.status_code == 200
+    assert sleeps == []
+    assert scheduler.rate is None
+
+
+def test_retry_with_exponential_backoff(scheduler, sleeps):
+    responses = iter([make_response(500), make_response(502), make_response(200)])
+
+    response = scheduler.request(lambda: next(responses))
+
+    assert response.status_code == 200
+    assert sleeps == [1.0, 2.0]
+    assert scheduler.retries == 2
+
+
+def test_throttle_honors_retry_after_and_slows_down(scheduler, sleeps):
+    responses = iter([make_response(429, retry_after="7"), make_response(200)])
+
+    response = scheduler.request(lambda: next(responses))
+
+    assert response.status_code == 200
+    assert sleeps[0] == 7.0
+    assert scheduler.throttled == 1
+    assert scheduler.concurrency == 4
+    assert scheduler.rate == 4.5
+
+
+def test_retry_after_is_clamped_to_max_delay(scheduler, sleeps):
+    responses = iter([make_response(429, retry_after="100000"), make_response(200)])
+
+    response = scheduler.request(lambda: next(responses))
+
+    assert response.status_code == 200
+    assert sleeps == [scheduler.max_delay]
+
+
+def test_gives_up_after_max_retries(scheduler, sleeps):
+    response = scheduler.request(lambda: make_response(503))
+    assert response.status_code == 503
+    assert scheduler.retries == 3
+    assert scheduler.concurrency == 1
+
+
+def test_client_errors_are_not_retried(scheduler, sleeps):
+    response = scheduler.request(lambda: make_response(404))
+    assert response.status_code == 404
+    assert sleeps == []
+
+
+def test_connection_error_reraised(scheduler):
+    def send():
+        raise requests.ConnectionError("нет сети")
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.request(send)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("5", 5.0), ("", None), ("abc", None), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+)
+def test_parse_retry_after(value, expected):
+    assert RequestScheduler.parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_naive_date():
+    delay = RequestScheduler.parse_retry_after("Wed, 21 Oct 2015 07:28:00 -0000")
+    assert delay == 0.0
@@ -0,0 +1,129 @@
+from unittest.mock import patch
+
+import pytest
+
+from src import serializers
+from src.convert import convert, main
+from src.fileworker import FileWorker
+from src.serializers import SERIALIZERS, detect_serializer, get_serializer
+from src.vacancy import Vacancy
+
+RECORDS = [
+    {
+        "name": "Штукатур-маляр",
+        "published_at": "20.01.2025",
+        "city": "Новокузнецк",
+        "salary": {"from": 65000},
+        "snippet": {"requirement": "Опыт работы."},
+        "alternate_url": "https://hh.ru/vacancy/115901556",
+    },
+    {
+        "name": "Бухгалтер",
+        "published_at": "21.01.2025",
+        "city": "Москва",
+        "salary": {"from": 0},
+        "snippet": {"requirement": "Знание 1С."},
+        "alternate_url": "https://hh.ru/vacancy/115901557",
+    },
+]
+
+
+def available_formats():
+    formats = []
+    for name in SERIALIZERS:
+        if name == "msgpack" and serializers.msgpack is None:
+            continue
+        if name == "orjson" and serializers.orjson is None:
+            continue
+        formats.append(name)
+    return formats
+
+
+@pytest.mark.parametrize("name", available_formats())
+def test_round_trip_and_detection(name, tmp_path):
+    path = tmp_path / "vacancies.dat"
+    serializer = get_serializer(name)
+
+    serializer.dump(iter(RECORDS), path)
+
+    detected = detect_serializer(path)
+    assert detected.load(path) == RECORDS
+    assert list(detected.iter_load(path)) == RECORDS
+
+
+@pytest.mark.parametrize("name", available_formats())
+def test_iter_tail_reads_appended_records(name, tmp_path):
+    path = tmp_path / "vacancies.dat"
+    serializer = get_serializer(name)
+    serializer.dump(RECORDS[:1], path)
+    detected = detect_serializer(path)
+    offset = detected.tail_offset(path)
+
+    detected.append(RECORDS[1:], path)
+
+    assert list(detected.iter_tail(path, offset)) == RECORDS[1:]
+    assert list(detected.iter_tail(path, detected.tail_offset(path))) == []
+
+
+def test_compact_json_is_smaller(tmp_path):
+    get_serializer("json").dump(RECORDS, tmp_path / "pretty.json")
+    get_serializer("json-compact").dump(RECORDS, tmp_path / "compact.json")
+    assert (tmp_path / "compact.json").stat().st_size < (
+        tmp_path / "pretty.json"
+    ).stat().st_size
+
+
+@pytest.mark.parametrize("name", ["json-compact", "orjson"])
+def test_compact_file_stays_compact(name, tmp_path):
+    if name == "orjson" and serializers.orjson is None:
+        pytest.skip("orjson не установлен")
+    path = tmp_path / "vacancies.json"
+    get_serializer(name).dump(RECORDS[:1], path)
+
+    detected = detect_serializer(path)
+    detected.append(RECORDS[1:], path)
+
+    assert detected.name in ("json-compact", "orjson")
+    assert b"\n" not in path.read_bytes()
+    assert detected.load(path) == RECORDS
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        get_serializer("xml")
+
+
+def test_detect_missing_or_empty(tmp_path):
+    assert detect_serializer(tmp_path / "missing.json") is None
+    (tmp_path / "empty.json").write_text("  \n", encoding="utf-8")
+    assert detect_serializer(tmp_path / "empty.json") is None
+
+
+@pytest.mark.parametrize("name", available_formats())
+def test_file_worker_with_format(name, tmp_path):
+    worker = FileWorker(tmp_path / "vacancies.dat", name)
+    worker.save([Vacancy.from_dict(record) for record in RECORDS])
+
+    assert [v.to_dict() for v in FileWorker(worker.file_json).load()] == RECORDS
+    assert len(list(worker.iter_load())) == 2
+
+
+def test_convert_in_place(tmp_path):
+    path = tmp_path / "vacancies.json"
+    get_serializer("json").dump(RECORDS, path)
+
+    assert convert(path, "jsonl") == 2
+
+    assert detect_serializer(path).name == "jsonl"
+    assert detect_serializer(path).load(path) == RECORDS
+
+
+def test_convert_command_compacts(tmp_path, capsys):
+    path = tmp_path / "vacancies.jsonl"
+    get_serializer("jsonl").dump(RECORDS + RECORDS[:1], path)
+
+    with patch("sys.argv", ["convert", str(path), "--compact"]):
+        main()
+
+    assert "осталось вакансий: 2" in capsys.readouterr().out
+    assert detect_serializer(path).load(path) == RECORDS
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from src.fileworker import FileWorker
+from src.session import DatasetCache
+from src.vacancy import Vacancy
+
+
+def make_vacancy(number):
+    return Vacancy(
+        f"Вакансия {number}",
+        "01.01.2023",
+        "Москва",
+        1000 * number,
+        "Описание",
+        f"http://example.com/{number}",
+    )
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    file_path = tmp_path / "vacancies.json"
+    worker = FileWorker(file_path)
+    worker.save([make_vacancy(1)])
+    return DatasetCache(worker, file_path)
+
+
+def test_vacancies_loaded_once(dataset, mocker):
+    load = mocker.spy(dataset.file_worker, "load")
+
+    first = dataset.get_vacancies()
+    second = dataset.get_vacancies()
+
+    assert first is second
+    assert load.call_count == 1
+
+
+def test_reload_after_file_change(dataset):
+    salary_index = dataset.salary_index()
+    assert dataset.salary_index() is salary_index
+
+    dataset.file_worker.save([make_vacancy(2)])
+    os.utime(dataset.storage_file, ns=(0, 0))
+
+    assert len(dataset.get_vacancies()) == 2
+    assert dataset.salary_index() is not salary_index
+
+
+def test_invalidate(dataset, mocker):
+    dataset.get_vacancies()
+    load = mocker.spy(dataset.file_worker, "load")
+
+    dataset.invalidate()
+    dataset.get_vacancies()
+
+    assert load.call_count == 1
+
+
+def test_table_follows_file(dataset):
+    table = dataset.table()
+    assert dataset.table() is table
+
+    dataset.file_worker.save([make_vacancy(2)])
+    os.utime(dataset.storage_file, ns=(0, 0))
+
+    assert [v.salary for v in dataset.table().get_top_n(2)] == [2000, 1000]
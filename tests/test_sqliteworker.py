@@ -0,0 +1,153 @@
+import sqlite3
+from contextlib import closing
+from unittest.mock import patch
+
+import pytest
+
+from src.salary import rates
+from src.sqliteworker import SQLiteWorker
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def worker(tmp_path):
+    worker = SQLiteWorker(tmp_path / "vacancies.db")
+    worker.save(
+        [
+            Vacancy(
+                "Программист",
+                "15.01.2023",
+                "Москва",
+                100000,
+                "Знание Python",
+                "http://url1",
+            ),
+            Vacancy(
+                "Тестировщик",
+                "10.02.2023",
+                "Казань",
+                80000,
+                "Знание PYTEST",
+                "http://url2",
+            ),
+            Vacancy(
+                "Аналитик",
+                "неверная_дата",
+                "Москва",
+                "Зарплата не указана",
+                "SQL",
+                "http://url3",
+            ),
+        ]
+    )
+    return worker
+
+
+def test_save_and_load(worker):
+    vacancies = worker.load()
+    assert [v.title for v in vacancies] == ["Программист", "Тестировщик", "Аналитик"]
+    assert vacancies[2].salary == "Зарплата не указана"
+    assert vacancies[2].salary_rub is None
+
+
+def test_salary_is_stored_typed(tmp_path):
+    worker = SQLiteWorker(tmp_path / "vacancies.db")
+    with patch.dict(rates.table(), {"USD": 100.0}):
+        worker.save(
+            [
+                Vacancy("Инженер", "", "Москва", 1000, "А", "http://u1", 2000, "USD"),
+                Vacancy("Тестер", "", "Москва", 1000, "Б", "http://u2", None, "XXX"),
+            ]
+        )
+
+    with patch.dict(rates.table(), {"USD": 1.0}):
+        first, second = worker.load()
+    assert (first.salary_from, first.salary_to, first.currency) == (1000, 2000, "USD")
+    assert first.salary_rub == 100000
+    assert second.salary_rub is None
+    assert [v.url for v in worker.filter_by_salary(0, 10**9)] == ["http://u1"]
+    assert [v.url for v in worker.get_top_n(2)] == ["http://u1", "http://u2"]
+
+
+def test_migrates_rub_only_schema(tmp_path):
+    file_db = tmp_path / "vacancies.db"
+    with closing(sqlite3.connect(file_db)) as connection, connection:
+        connection.executescript(
+            "CREATE TABLE vacancies (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+            "published_at TEXT, published_ord INTEGER NOT NULL DEFAULT 0, city TEXT, "
+            "salary INTEGER NOT NULL DEFAULT 0, description TEXT NOT NULL, "
+            "url TEXT NOT NULL UNIQUE);"
+            "INSERT INTO vacancies (title, city, salary, description, url) VALUES "
+            "('А', 'Москва', 50000, 'Б', 'http://u1'), "
+            "('В', 'Москва', 0, 'Г', 'http://u2');"
+        )
+
+    vacancies = SQLiteWorker(file_db).load()
+
+    assert [v.salary_rub for v in vacancies] == [50000, None]
+
+
+def test_save_ignores_existing_url(worker):
+    worker.save(
+        [Vacancy("Программист", "15.01.2023", "Москва", 1, "Python", "http://url1")]
+    )
+    assert worker.count() == 3
+
+
+def test_filter_by_salary(worker):
+    assert [v.title for v in worker.filter_by_salary(50000, 90000)] == ["Тестировщик"]
+
+
+def test_get_top_n(worker):
+    assert [v.title for v in worker.get_top_n(2)] == ["Программист", "Тестировщик"]
+
+
+def test_sort_by_date(worker):
+    assert [v.title for v in worker.sort_by_date()] == [
+        "Тестировщик",
+        "Программист",
+        "Аналитик",
+    ]
+
+
+def test_filter_by_city(worker):
+    assert len(worker.filter_by_city("Москва")) == 2
+
+
+def test_filter_by_keywords_case_insensitive(worker):
+    assert [v.title for v in worker.filter_by_keywords(["знание", "pytest"])] == [
+        "Тестировщик"
+    ]
+
+
+def test_clear(worker):
+    worker.clear()
+    assert worker.load() == []
+
+
+def test_filter_by_keywords_searches_title(worker):
+    assert [v.title for v in worker.filter_by_keywords(["аналитик", "sql"])] == [
+        "Аналитик"
+    ]
+
+
+def test_vacancy_queries_run_in_database(worker):
+    with patch("builtins.input", side_effect=["50000", "150000"]):
+        found = Vacancy.filter_vacancies_by_salary(worker)
+    assert [v.title for v in found] == ["Тестировщик", "Программист"]
+
+    with patch("builtins.input", return_value="знание"):
+        found = Vacancy.filter_vacancies_by_keywords(worker)
+    assert [v.title for v in found] == ["Программист", "Тестировщик"]
+
+    assert [v.title for v in Vacancy.get_top_n_vacancies(worker, 1)] == ["Программист"]
+    assert Vacancy.sort_vacancies_by_date(worker)[0].title == "Тестировщик"
+
+
+def test_clear_data_asks_for_confirmation(worker):
+    with patch("builtins.input", return_value="нет"):
+        worker.clear_data()
+    assert worker.count() == 3
+    with patch("builtins.input", return_value="да"):
+        worker.clear_data()
+    assert worker.count() == 0
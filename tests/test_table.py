@@ -0,0 +1,120 @@
+import heapq
+import json
+from array import array
+from operator import attrgetter
+
+import pytest
+
+from benchmarks.generator import generate_records
+from src.fileworker import FileWorker
+from src.indexes import DateIndex, SalaryIndex
+from src.table import VacancyTable
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def vacancies():
+    return [
+        Vacancy(
+            "Программист", "15.01.2023", "Москва", 100000, "Знание Python", "http://u1"
+        ),
+        Vacancy(
+            "Тестировщик", "10.02.2023", "Казань", "80000", "Знание SQL", "http://u2"
+        ),
+        Vacancy(
+            "Аналитик", "неверная_дата", "Москва", None, "SQL, Python", "http://u3"
+        ),
+        Vacancy("Менеджер", "20.01.2023", "Москва", 120000, "Переговоры", "http://u4"),
+    ]
+
+
+@pytest.fixture
+def table(vacancies):
+    return VacancyTable.from_vacancies(vacancies)
+
+
+def test_columns(table):
+    assert len(table) == 4
+    assert list(table.salaries) == [100000, 80000, 0, 120000]
+    assert table.cities[0] is table.cities[2]
+
+
+def test_filter_salary(table):
+    assert table.filter_salary(0, 100000) == [0, 1]
+
+
+def test_filter_city(table):
+    assert table.filter_city("Москва") == [0, 2, 3]
+
+
+def test_filter_keywords(table):
+    assert table.filter_keywords(["sql", "python"]) == [2]
+
+
+def test_sort_by_date(table):
+    assert table.date_order() == [1, 3, 0, 2]
+
+
+def test_top_n_returns_vacancy_views(table):
+    top = table.vacancies(table.top_n(2))
+    assert [v.title for v in top] == ["Менеджер", "Программист"]
+    assert isinstance(top[0], Vacancy)
+
+
+def test_from_file(vacancies, tmp_path):
+    file_json = tmp_path / "vacancies.json"
+    file_json.write_text(
+        json.dumps([v.to_dict() for v in vacancies], ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+    table = VacancyTable.from_file(file_json)
+
+    assert table.urls == ["http://u1", "http://u2", "http://u3", "http://u4"]
+
+
+def test_row_keeps_salary_range_and_currency():
+    vacancy = Vacancy("Инженер", "", "Москва", 1000, "А", "http://u", 2000, "USD")
+    row = VacancyTable.from_vacancies([vacancy]).row(0)
+
+    assert (row.salary_from, row.salary_to, row.currency) == (1000, 2000, "USD")
+    assert row.salary_rub == vacancy.salary_rub
+
+
+def test_from_file_detects_format(vacancies, tmp_path):
+    path = tmp_path / "vacancies.jsonl"
+    FileWorker(path, "jsonl").save(vacancies)
+
+    table = VacancyTable.from_file(path)
+
+    assert table.urls == ["http://u1", "http://u2", "http://u3", "http://u4"]
+    assert len(VacancyTable.from_file(tmp_path / "missing.json")) == 0
+
+
+def test_columns_are_arrays(table, vacancies):
+    assert isinstance(table.salary_from, array)
+    assert isinstance(table.salary_to, array)
+    assert table.raw_dates == {2: "неверная_дата"}
+    fields = attrgetter("published_at", "salary_value", "url")
+    assert [fields(row) for row in table.vacancies()] == list(map(fields, vacancies))
+    assert [row.salary_text() for row in table.vacancies()] == [
+        v.salary_text() for v in vacancies
+    ]
+
+
+def test_queries_match_list_queries():
+    vacancies = [Vacancy.from_dict(item) for item in generate_records(300, seed=3)]
+    table = VacancyTable.from_vacancies(vacancies)
+
+    def urls(found):
+        return [v.url for v in found]
+
+    assert urls(table.filter_by_salary(50000, 150000)) == urls(
+        SalaryIndex.build(vacancies).search(50000, 150000, vacancies)
+    )
+    assert urls(table.get_top_n(20)) == urls(
+        heapq.nlargest(20, vacancies, key=attrgetter("salary_value"))
+    )
+    assert urls(table.sort_by_date()) == urls(
+        DateIndex.build(vacancies).ordered(vacancies, reverse=True)
+    )
@@ -1,8 +1,10 @@
+from datetime import date
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.vacancy import Vacancy
+from src.indexes import KeywordIndex
+from src.vacancy import LazyVacancy, Vacancy
 
 
 @pytest.fixture
@@ -58,6 +60,15 @@ def test_filter_vacancies_no_match(vacancy):
         assert len(filtered_vacancies) == 0
 
 
+def test_filter_vacancies_by_keywords_with_index(vacancy):
+    vacancies = [vacancy]
+    index = KeywordIndex.build(vacancies)
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("builtins.input", lambda _: "python  программист")
+        filtered_vacancies = Vacancy.filter_vacancies_by_keywords(vacancies, index)
+        assert filtered_vacancies == [vacancy]
+
+
 def test_vacancy_to_dict(vacancy):
     expected_dict = {
         "name": "Программист",
@@ -145,6 +156,28 @@ def test_get_top_n_vacancies():
     assert top_vacancies[1].title == "Вакансия 1"
 
 
+def test_get_top_n_vacancies_from_stream():
+    vacancies = (
+        Vacancy(f"Вакансия {i}", "01.01.2023", "Москва", salary, "Описание", "http://u")
+        for i, salary in enumerate([30000, "100 000", None, 100000, "abc"])
+    )
+
+    top_vacancies = Vacancy.get_top_n_vacancies(vacancies, 3)
+
+    assert [v.title for v in top_vacancies] == [
+        "Вакансия 1",
+        "Вакансия 3",
+        "Вакансия 0",
+    ]
+
+
+def test_salary_value_follows_salary(vacancy):
+    assert vacancy.salary_value == 100000
+    vacancy.salary = "200000"
+    assert vacancy.salary_value == 200000
+    assert vacancy > Vacancy("А", "", "Москва", 1, "Б", "http://u")
+
+
 @patch("builtins.input", side_effect=["2"])
 @patch("builtins.print")
 def test_display_top_n_vacancies(mock_print, mock_input):
@@ -207,13 +240,37 @@ def vacancies():
 
 
 def test_sort_vacancies_by_date(vacancies):
-    Vacancy.sort_vacancies_by_date(vacancies)
+    sorted_vacancies = Vacancy.sort_vacancies_by_date(vacancies)
 
-    sorted_titles = [v.title for v in vacancies if v.published_at is not None]
+    sorted_titles = [v.title for v in sorted_vacancies]
 
-    expected_titles = ["Вакансия 1", "Вакансия 2", "Вакансия 3", "Вакансия 5"]
+    expected_titles = [
+        "Вакансия 2",
+        "Вакансия 5",
+        "Вакансия 1",
+        "Вакансия 3",
+        "Вакансия 4",
+    ]
 
     assert sorted_titles == expected_titles
+    assert vacancies[0].published_at == "15.01.2023"
+    assert vacancies[3].published_at == "неверная_дата"
+
+
+@pytest.mark.parametrize(
+    "published_at, expected",
+    [
+        ("15.01.2023", date(2023, 1, 15).toordinal()),
+        ("2023-01-15", date(2023, 1, 15).toordinal()),
+        ("2023-01-15T10:00:00+03:00", date(2023, 1, 15).toordinal()),
+        (date(2023, 1, 15), date(2023, 1, 15).toordinal()),
+        ("неверная_дата", 0),
+        (None, 0),
+    ],
+)
+def test_published_ord(published_at, expected):
+    vacancy = Vacancy("Вакансия", published_at, "Москва", 1, "Описание", "http://url")
+    assert vacancy.published_ord == expected
 
 
 @pytest.mark.parametrize(
@@ -235,5 +292,60 @@ def test_get_salary(salary_input, expected_output):
     assert vacancy.get_salary() == expected_output
 
 
+def test_dedup_key():
+    hh_vacancy = Vacancy(
+        "Вакансия", "", "Москва", 1, "Описание", "https://hh.ru/vacancy/116313470"
+    )
+    other = Vacancy("Вакансия", "", "Москва", 1, "Описание", "http://url")
+
+    assert hh_vacancy.vacancy_id == 116313470
+    assert hh_vacancy.dedup_key == 116313470
+    assert other.vacancy_id is None
+    assert other.dedup_key >= 1 << 63
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {
+            "name": "Штукатур-маляр",
+            "published_at": "20.01.2025",
+            "city": "Новокузнецк",
+            "salary": {"from": 65000},
+            "snippet": {"requirement": "Опыт работы."},
+            "alternate_url": "https://hh.ru/vacancy/115901556",
+        },
+        {
+            "name": "Бухгалтер",
+            "published_at": "неверная_дата",
+            "city": "Москва",
+            "salary": {"from": None},
+            "snippet": {"requirement": "Знание 1С."},
+            "alternate_url": "https://hh.ru/vacancy/115901557",
+        },
+        {
+            "name": "Кладовщик",
+            "published_at": "2025-01-21",
+            "city": "Казань",
+            "salary": {"from": "50 000"},
+            "snippet": {"requirement": ""},
+            "alternate_url": "http://url",
+        },
+    ],
+)
+def test_from_trusted_and_lazy_match_from_dict(item):
+    expected = Vacancy.from_dict(item)
+    trusted = Vacancy.from_trusted(item)
+    lazy = LazyVacancy(item)
+
+    for vacancy in (trusted, lazy):
+        assert vacancy.to_dict() == expected.to_dict()
+        assert vacancy.salary == expected.salary
+        assert vacancy.salary_value == expected.salary_value
+        assert vacancy.published_ord == expected.published_ord
+        assert vacancy.dedup_key == expected.dedup_key
+    assert lazy.materialize().to_dict() == expected.to_dict()
+
+
 if __name__ == "__main__":
     pytest.main()